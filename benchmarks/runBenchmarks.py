@@ -0,0 +1,268 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from time import perf_counter, sleep
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants.timeRange import TimeRange
+from utils.candles import CANDLE_INTERVALS, CandleSeries, pick_interval
+from utils.chartFigures import apply_chart_style, build_candlestick_figure, build_line_figure
+from utils.dataParser import parse_real_time_data
+from utils.downsample import downsample
+from utils.fakeOlsenServer import FakeOlsenServer
+from utils.getTimeRangeSpecificData import get_time_specific_data
+from utils.realTimeHub import RealTimeHub
+from utils.snapshotCache import ingest_feed
+from utils.syntheticFeed import (
+    generate_real_time_batches, generate_symbol_block_feed, generate_timestamped_feed, iter_chunks, make_symbols,
+)
+from utils.tickStore import TickStore
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# Run fn `repeat` times for wall time, then once more under tracemalloc for its peak memory
+# (tracing slows pure-Python code several-fold, so it is kept out of the timed runs)
+def measure(fn, repeat):
+    seconds, result = [], None
+    for _ in range(repeat):
+        started = perf_counter()
+        result = fn()
+        seconds.append(perf_counter() - started)
+    return result, seconds, [traced_peak(fn)]
+
+def traced_peak(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def summarize(seconds, rows=None, peaks=None):
+    latencies_ms = np.asarray(seconds) * 1000
+    summary = {
+        'runs': len(seconds),
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p95_ms': float(np.percentile(latencies_ms, 95)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+        'total_s': float(np.sum(seconds)),
+    }
+    if rows is not None:
+        summary['rows'] = rows
+        summary['rows_per_s'] = rows / float(np.median(seconds)) if np.median(seconds) else None
+    if peaks is not None:
+        summary['peak_mem_mb'] = max(peaks) / 1e6
+    return summary
+
+# A feed's chunks parsed and appended into a fresh store the way the app ingests them
+def ingest(chunks, feed, workers):
+    store = TickStore()
+    ingest_feed(store, chunks, feed, workers=workers)
+    return store
+
+def bench_parsers(payloads, repeat, workers=0):
+    stages = {}
+    for feed in ('hist1s', 'hist1m', 'hist1h'):
+        name = 'parse_' + feed
+        payload = payloads[name]
+        if workers > 1:
+            ingest(payload, feed, workers)  # keep worker start-up out of the timed runs
+        store, seconds, peaks = measure(lambda: ingest(iter_chunks(payload), feed, workers), repeat)
+        stages[name] = summarize(seconds, rows=len(store), peaks=peaks)
+        stages[name]['bytes'] = len(payload)
+        payloads[name + '_store'] = store
+    return stages
+
+def bench_real_time(batches):
+    historic_data = {}
+    seconds = []
+    rows = 0
+    for batch in batches:
+        started = perf_counter()
+        rows += len(parse_real_time_data(batch.decode('ascii'), historic_data))
+        seconds.append(perf_counter() - started)
+
+    def parse_all():
+        history = {}
+        for batch in batches:
+            parse_real_time_data(batch.decode('ascii'), history)
+    peak = traced_peak(parse_all)
+    summary = summarize(seconds, peaks=[peak])
+    summary['rows'] = rows
+    summary['rows_per_s'] = rows / sum(seconds) if sum(seconds) else None
+    return summary
+
+def bench_time_ranges(stores, symbol, current_date, repeat):
+    stages = {}
+    for time_range in TimeRange:
+        result, seconds, peaks = measure(
+            lambda: get_time_specific_data(time_range.value, symbol, *stores, current_date), repeat
+        )
+        stages[time_range.value] = summarize(seconds, rows=len(result[0]), peaks=peaks)
+    return stages
+
+# Range lookup + LTTB + figure build + styling, as the historical tab does on a cache miss
+def bench_chart_pipeline(stores, symbol, current_date, max_points, repeat):
+    stages = {}
+    for time_range in (TimeRange.LAST_24HR_SECOND, TimeRange.LAST_MONTH_MINUTE, TimeRange.LAST_YEAR_HOURLY):
+        def pipeline():
+            timestamps, prices = get_time_specific_data(time_range.value, symbol, *stores, current_date)
+            if not len(timestamps):
+                return None
+            chart_ts, chart_prices = downsample(timestamps, prices, max_points)
+            return apply_chart_style(build_line_figure(chart_ts, chart_prices, time_range.value), "Trading View")
+        _, seconds, peaks = measure(pipeline, repeat)
+        stages[time_range.value] = summarize(seconds, peaks=peaks)
+
+        # Same range as candles at the interval the Candlestick chart picks by default
+        def candle_pipeline():
+            timestamps, prices = get_time_specific_data(time_range.value, symbol, *stores, current_date)
+            if not len(timestamps):
+                return None
+            source_interval = int(np.min(np.diff(timestamps))) if len(timestamps) > 1 else 1
+            interval = pick_interval(int(timestamps[-1] - timestamps[0]), source_interval, 500)
+            candles = CandleSeries(CANDLE_INTERVALS[interval])
+            candles.extend(timestamps, prices)
+            return apply_chart_style(build_candlestick_figure(candles.bars, time_range.value), "Trading View")
+        _, seconds, peaks = measure(candle_pipeline, repeat)
+        stages[f"{time_range.value}, candles"] = summarize(seconds, peaks=peaks)
+    return stages
+
+# Download + parse of each history feed, and rt throughput, against a local fake Olsen server
+def bench_ssh(payloads, symbols, args):
+    feeds = ('hist1s', 'hist1m', 'hist1h')
+    server = FakeOlsenServer(
+        symbols=symbols, history={feed: payloads['parse_' + feed] for feed in feeds},
+        tick_rate=args.tick_rate, burst_size=args.burst_size, fragment=args.fragment,
+    ).start()
+    pool = server.connection_pool()
+    stages = {}
+    try:
+        for feed in feeds:
+            def download():
+                channel = pool.open_shell(feed)
+                try:
+                    return ingest(iter(lambda: channel.recv(65536), b''), feed, args.parse_workers)
+                finally:
+                    channel.close()
+            store, seconds, peaks = measure(download, args.repeat)
+            stages[f"ssh_ingest[{feed}]"] = summarize(seconds, rows=len(store), peaks=peaks)
+
+        arrivals = []
+        hub = RealTimeHub(connect=lambda: pool.open_shell('rt'))
+        hub.add_listener(lambda rows: arrivals.append((perf_counter(), len(rows))))
+        hub.start()
+        sleep(args.rt_seconds)
+        hub.stop()
+        gaps = np.diff([arrived for arrived, _ in arrivals]) if len(arrivals) > 1 else [0.0]
+        summary = summarize(gaps)
+        summary['rows'] = sum(count for _, count in arrivals)
+        summary['rows_per_s'] = summary['rows'] / args.rt_seconds
+        stages['ssh_rt_publish_interval'] = summary
+    finally:
+        pool.close()
+        server.stop()
+    return stages
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(args):
+    symbols = make_symbols(args.symbols)
+    current_date = datetime.now().replace(microsecond=0)
+    print(f"Generating synthetic feeds for {len(symbols)} symbols...")
+    payloads = {
+        'parse_hist1s': generate_timestamped_feed(
+            symbols, current_date - timedelta(hours=args.second_hours), args.second_hours * 3600, 1, seed=1),
+        'parse_hist1m': generate_timestamped_feed(
+            symbols, current_date - timedelta(days=args.minute_days), args.minute_days * 1440, 60, seed=2),
+        'parse_hist1h': generate_symbol_block_feed(
+            symbols, datetime(current_date.year - 1, 1, 1),
+            int((current_date - datetime(current_date.year - 1, 1, 1)).total_seconds() // 3600), seed=3),
+    }
+    batches = list(generate_real_time_batches(symbols, current_date, args.rt_batches, seed=4))
+
+    results = {
+        'meta': {
+            'revision': git_revision(),
+            'timestamp': current_date.isoformat(),
+            'python': sys.version.split()[0],
+            'cpus': os.cpu_count(),
+            'config': vars(args),
+        },
+        'stages': {},
+    }
+    stages = results['stages']
+    print("Benchmarking parsers...")
+    stages.update(bench_parsers(payloads, args.repeat, args.parse_workers))
+    print("Benchmarking real-time parsing...")
+    stages['parse_real_time_data'] = bench_real_time(batches)
+    stores = (payloads['parse_hist1s_store'], payloads['parse_hist1m_store'], payloads['parse_hist1h_store'])
+    print("Benchmarking time range lookups...")
+    for name, summary in bench_time_ranges(stores, symbols[0], current_date, args.repeat).items():
+        stages[f"get_time_specific_data[{name}]"] = summary
+    print("Benchmarking chart pipeline...")
+    for name, summary in bench_chart_pipeline(stores, symbols[0], current_date, args.max_points, args.repeat).items():
+        stages[f"chart_pipeline[{name}]"] = summary
+    if args.ssh:
+        print("Benchmarking ingestion over SSH...")
+        stages.update(bench_ssh(payloads, symbols, args))
+    return results
+
+def print_results(results, baseline=None):
+    baseline_stages = (baseline or {}).get('stages', {})
+    print(f"\n{'stage':<50} {'p50 ms':>10} {'p95 ms':>10} {'rows/s':>14} {'peak MB':>9} {'vs base':>9}")
+    for name, summary in results['stages'].items():
+        rows_per_s = summary.get('rows_per_s')
+        previous = baseline_stages.get(name)
+        ratio = f"{summary['p50_ms'] / previous['p50_ms']:.2f}x" if previous and previous['p50_ms'] else ''
+        print(
+            f"{name:<50} {summary['p50_ms']:>10.2f} {summary['p95_ms']:>10.2f} "
+            f"{(f'{rows_per_s:,.0f}' if rows_per_s else ''):>14} {summary.get('peak_mem_mb', 0):>9.1f} {ratio:>9}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the feed parsers, range lookups and chart pipeline on synthetic Olsen data")
+    parser.add_argument('--symbols', type=int, default=3, help="number of symbols in the synthetic universe")
+    parser.add_argument('--second-hours', type=int, default=48, help="hours of 1s history")
+    parser.add_argument('--minute-days', type=int, default=62, help="days of 1m history (62 covers last month)")
+    parser.add_argument('--rt-batches', type=int, default=2000, help="number of real-time tick batches")
+    parser.add_argument('--max-points', type=int, default=2000, help="chart downsampling target")
+    parser.add_argument('--parse-workers', type=int, default=0, help="parse the history feeds in this many worker processes")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per stage")
+    parser.add_argument('--ssh', action='store_true', help="also ingest the feeds over SSH from a local fake Olsen server")
+    parser.add_argument('--tick-rate', type=float, default=50.0, help="fake server rt batches per second (--ssh)")
+    parser.add_argument('--burst-size', type=int, default=1, help="fake server rt batches per write (--ssh)")
+    parser.add_argument('--fragment', action='store_true', help="fake server splits writes into random sizes (--ssh)")
+    parser.add_argument('--rt-seconds', type=float, default=5.0, help="seconds of rt to receive (--ssh)")
+    parser.add_argument('--output', help="results JSON path (default: benchmarks/results/<revision>-<time>.json)")
+    parser.add_argument('--compare', help="baseline results JSON to compare p50 latencies against")
+    args = parser.parse_args()
+
+    results = run(args)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{results['meta']['revision'] or 'local'}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSaved results to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -5,114 +5,135 @@
 import streamlit as st
 import pandas as pd
 from time import sleep, time
-from collections import defaultdict, deque
+from datetime import datetime, timedelta
 import threading
-import plotly.express as px
 import logging
 import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
-from constants.timeRange import TimeRange
-from utils.getTimeRangeSpecificData import get_time_specific_data
+from constants.timeRange import TIME_RANGE_FEEDS, TimeRange
+from utils.getTimeRangeSpecificData import EMPTY_RESULT, get_time_specific_data
 from utils.connectionUtils import connect_ssh_agent
-from utils.dataParser import parse_real_time_data, parse_hist1h_data, parse_hist1m_data, parse_hist1s_data
-
-# Retrieve Real-Time (rt) data  
-def get_real_time_data_rt(channel, historic_data):
-    if channel.recv_ready():
-        data = channel.recv(4096).decode('ascii')
-        table_data = parse_real_time_data(data, historic_data)
-    
-        for symbol in historic_data.keys():
-            if symbol not in [item['Symbol'] for item in table_data]:
-                last_known_price = historic_data[symbol][-1]
-                table_data.append({
-                    'Symbol': symbol,
-                    'Price': last_known_price,
-                    'Change': 0,
-                    '% Change': 0,
-                    'Trend': list(historic_data[symbol]),
-                })
-
-        return table_data
-
-# Retrieve Historical data
-def get_historical_data(userName, timeout=300):
-    print('connecting to ssh agent %s', userName)
+from utils.downsample import downsample
+from utils.candles import CANDLE_INTERVALS, CandleCache, pick_interval, window_candles
+from utils.chartFigures import (
+    apply_chart_style, build_candlestick_figure, build_heatmap_figure, build_line_figure, build_multi_line_figure,
+)
+from utils.crossAnalytics import compute_cross_analytics, spread_matrix, spread_series
+from utils.figureCache import FigureCache
+from utils.frameDiff import FrameDiff
+from utils.materializedViews import TimeRangeViews
+from utils.historyLoader import HistoryLoader, track_bytes
+from utils.liveHistory import FEED_INTERVALS, LiveHistory, get_feed_floor
+from utils.metrics import metrics, start_metrics_server
+from utils.realTimeHub import RealTimeHub
+from utils.resample import OHLC
+from utils.snapshotCache import SharedFeed, ingest_feed
+from utils.symbolRegistry import get_symbol_registry
+from utils.tickStore import TickStore, from_epoch, to_epoch
+
+# Retrieve Historical data, yielding raw byte chunks as they arrive on the channel
+def stream_historical_data(userName, timeout=300):
+    logging.info('Fetching history from ssh agent %s', userName)
     channel = connect_ssh_agent(userName)
-    print('connected to channel of ssh agent %s', userName)
-    print('fetching data for ssh channel of %s', userName)
-    buffer = ''
     start_time = time()
-    while True:
-        if channel.recv_ready():
-            data = channel.recv(16384).decode('ascii')
-            buffer += data
-        elif time() - start_time > timeout:
-            logging.warning(f"Timeout reached for fetching data from {userName}")
-            break
-        if channel.exit_status_ready():
+    try:
+        while True:
+            if channel.recv_ready():
+                data = channel.recv(16384)
+                metrics.inc('forex_ssh_bytes_total', len(data), feed=userName)
+                yield data
+                continue
+            if channel.exit_status_ready():
                 break
-        sleep(0.1)
-    print('fetching data for ssh channel of is completed', userName)
-    print('closing channel for ssh agent ', userName)
-    channel.close()
-    print('closed channel for ssh agent ', userName)
-    return buffer
-
-# Simulate multiple heavy data fetching functions
-def fetch_resource_1h():
-    historical_data_1h = get_historical_data("hist1h")
-    parsed_hist1h_data = parse_hist1h_data(historical_data_1h)
-    return parsed_hist1h_data
-
-
-def fetch_resource_1m():
-    historical_data_1m = get_historical_data("hist1m")
-    parsed_hist1m_data = parse_hist1m_data(historical_data_1m)
-    return parsed_hist1m_data
-
-def fetch_resource_1s():
-    historical_data_1s = get_historical_data("hist1s")
-    parsed_hist1s_data = parse_hist1s_data(historical_data_1s)
-    return parsed_hist1s_data
-
-# Background fetching function to run in parallel
-def fetch_all_historical_resources():
-    parsed_hist1s_data = [None]
-    parsed_hist1m_data = [None]
-    parsed_hist1h_data = [None]
-    
-    def cached_fetch_resource_1h():
-        parsed_hist1h_data[0] = fetch_resource_1h()
-
-    def cached_fetch_resource_1m():
-        parsed_hist1m_data[0] = fetch_resource_1m()
+            if time() - start_time > timeout:
+                logging.warning(f"Timeout reached for fetching data from {userName}")
+                break
+            sleep(0.1)
+        logging.info('Fetched history from ssh agent %s', userName)
+    finally:
+        channel.close()
+
+# Publish a feed snapshot; a failed write only costs other workers and the next cold start
+def publish_resource(shared, store):
+    try:
+        shared.publish(store)
+    except OSError as e:
+        logging.warning(f"Could not publish snapshot for {shared.feed}: {e}")
+
+# Download a feed through the progress counters and append its rows newer than the store's,
+# keeping only registered symbols (parsed in the pool when FOREX_PARSE_WORKERS is set)
+def append_feed(store, feed, progress):
+    chunks = track_bytes(stream_historical_data(feed), progress)
+    return ingest_feed(store, chunks, feed, get_symbol_registry().accepted, progress=progress)
+
+# Drop the rows older than any TimeRange still reads, so snapshots do not grow across restarts
+def trim_to_feed_floor(store, feed):
+    floor = get_feed_floor(feed, datetime.now())
+    return store.drop_before(floor) if floor is not None else 0
+
+# Fetch only the rows newer than the snapshot and publish the result; the snapshot's
+# expired rows are dropped first so only the rows still needed are copied into memory
+def refresh_resource(shared, store, progress):
+    dropped = trim_to_feed_floor(store, shared.feed)
+    appended = append_feed(store, shared.feed, progress)
+    logging.info(f"Refreshed {shared.feed} snapshot: {appended} rows appended, {dropped} expired rows dropped")
+    publish_resource(shared, store)
+
+# Attach to a feed's shared snapshot. The one worker holding the feed's writer lock
+# downloads on cold start or refreshes in the background; the others only attach.
+# Preloaded symbols stay in memory; the others are opened on first view and dropped under the budget.
+def fetch_resource(feed, progress):
+    registry = get_symbol_registry()
+    shared = SharedFeed(feed, resident=registry.preload, max_bytes=registry.cache_bytes)
+    if not shared.acquire_writer():
+        shared.wait()
+        return shared
+
+    store = shared.reload()
+    if store is None:
+        store = TickStore()
+        append_feed(store, feed, progress)
+        publish_resource(shared, store)
+    else:
+        # The refresh appends into a full store; sessions keep reading the lazy one until it is published
+        threading.Thread(
+            target=refresh_resource, args=(shared, store.to_tick_store(), progress), daemon=True
+        ).start()
+    return shared
+
+HISTORICAL_FEEDS = ('hist1h', 'hist1m', 'hist1s')
+
+# Each feed loads on its own future; the historical tab renders whichever are ready
+@st.cache_resource
+def get_history_loader():
+    return HistoryLoader({
+        feed: lambda progress, feed=feed: fetch_resource(feed, progress)
+        for feed in HISTORICAL_FEEDS
+    }).start()
 
-    def cached_fetch_resource_1s():
-        parsed_hist1s_data[0] = fetch_resource_1s()
+# Minimum seconds between real-time repaints
+RT_REPAINT_INTERVAL = 0.05
 
-    
-    thread1 = threading.Thread(target=cached_fetch_resource_1h)
-    thread2 = threading.Thread(target=cached_fetch_resource_1m)
-    thread3 = threading.Thread(target=cached_fetch_resource_1s)
+# Longest wait for a tick while nothing is waiting to be repainted
+RT_IDLE_POLL = 1.0
 
-    # Start threads
-    thread1.start()
-    thread2.start()
-    thread3.start()
+# Rolling window shown on the metric cards (one of rollingStats.WINDOWS)
+RT_STATS_WINDOW = '1h'
 
-    # Wait for all threads to finish
-    thread1.join()
-    thread2.join()
-    thread3.join()
+# Metric cards per row on the real-time tab
+RT_CARDS_PER_ROW = 4
 
-    return parsed_hist1s_data[0], parsed_hist1m_data[0], parsed_hist1h_data[0]
+# Points kept per symbol for the Trend sparkline
+RT_TREND_LENGTH = 100
 
+# One rt channel per server process, shared by every browser session
 @st.cache_resource
-def fetch_all_historical_resource_once():
-    return fetch_all_historical_resources()
+def get_real_time_hub():
+    hub = RealTimeHub(trend_length=RT_TREND_LENGTH, symbols=get_symbol_registry().accepted)
+    hub.add_listener(get_live_history().on_rows)
+    return hub.start()
 
 def display_real_time_data():
     st.markdown("### 🔄 Real-Time Price Updates")
@@ -157,95 +178,103 @@ def display_real_time_data():
     </style>
     """, unsafe_allow_html=True)
     
-    # Predefined symbols to ensure only these are shown
-    PREDEFINED_SYMBOLS = ['EURUSD', 'GBPUSD', 'USDCHF']
-    
-    # Initialize session state variables
-    if 'rt_historic_data' not in st.session_state:
-        st.session_state.rt_historic_data = defaultdict(deque)
-    if 'highest_prices' not in st.session_state:
-        st.session_state.highest_prices = {symbol: 0 for symbol in PREDEFINED_SYMBOLS}
-    if 'lowest_prices' not in st.session_state:
-        st.session_state.lowest_prices = {symbol: float('inf') for symbol in PREDEFINED_SYMBOLS}
-    if 'rt_channel' not in st.session_state:
-        st.session_state.rt_channel = connect_ssh_agent("rt")
+    # Registered symbols, in table order
+    PREDEFINED_SYMBOLS = sorted(get_symbol_registry().symbols)
     
     # Create static metric cards container
     st.markdown("### 📊 Price Statistics")
-    metric_cols = st.columns(len(PREDEFINED_SYMBOLS))
+    metric_cols = st.columns(min(len(PREDEFINED_SYMBOLS), RT_CARDS_PER_ROW))
     
     # Create metric card placeholders
     metric_cards = {}
     for idx, symbol in enumerate(PREDEFINED_SYMBOLS):
-        with metric_cols[idx]:
+        with metric_cols[idx % len(metric_cols)]:
             metric_cards[symbol] = st.empty()
     
-    # Create data table placeholder
+    # Create data table placeholders; the heading is drawn once, the table on every change
+    table_heading = st.empty()
     data_placeholder = st.empty()
     
     # Initialize a dataframe in session state if it doesn't exist
     if 'rt_table_data' not in st.session_state:
         st.session_state.rt_table_data = pd.DataFrame(columns=['Symbol', 'Trend', 'Price', 'Change', '% Change'])
 
+    # Subscribe to the shared real-time feed; the first poll returns the latest snapshot
+    hub = get_real_time_hub()
+    subscription = hub.subscribe()
+    latest_rows = {}
+    row_updates = dict.fromkeys(PREDEFINED_SYMBOLS, 0)
+    dirty_symbols = set()
+    frame = FrameDiff()
+    pending_since = None
+    last_repaint = 0.0
+
     while True:
-        new_data_rt = get_real_time_data_rt(
-            st.session_state.rt_channel, 
-            st.session_state.rt_historic_data
-        )
-        
-        if new_data_rt:
-            # Filter and sort data for predefined symbols
-            filtered_data = [
-                item for item in new_data_rt 
-                if item['Symbol'] in PREDEFINED_SYMBOLS
-            ]
-            
-            # Create a new DataFrame from the filtered data
-            new_df = pd.DataFrame(filtered_data)
-            new_df['% Change'] = new_df['% Change'].apply(lambda x: f"{x:.2f}%")
-            new_df = new_df[['Symbol', 'Trend', 'Price', 'Change', '% Change']].sort_values(by='Symbol').drop_duplicates(subset=['Symbol'])
-
-
-            # Efficiently update the session state DataFrame
-            st.session_state.rt_table_data = new_df
-
-            for item in filtered_data:
-                item['% Change'] = f"{item['% Change']:.2f}%" 
-
-            # Update highest and lowest prices
-            for item in filtered_data:
-                symbol = item['Symbol']
-                price = item['Price']
-                st.session_state.highest_prices[symbol] = max(
-                    st.session_state.highest_prices[symbol],
-                    price
+        # With ticks pending, wait only for what is left of the repaint interval so they are drawn
+        # as soon as it runs out; otherwise block until the next tick arrives
+        timeout = max(0.0, RT_REPAINT_INTERVAL - (time() - last_repaint)) if dirty_symbols else RT_IDLE_POLL
+        changed_rows = subscription.poll(timeout=timeout)
+        if changed_rows:
+            changed_symbols = changed_rows.keys() & PREDEFINED_SYMBOLS
+            if changed_symbols:
+                if not dirty_symbols:
+                    pending_since = hub.received_at or time()
+                dirty_symbols |= changed_symbols
+                for symbol in changed_symbols:
+                    latest_rows[symbol] = changed_rows[symbol]
+                    row_updates[symbol] += 1
+
+        # Ticks are ingested as they arrive; the page repaints at most once per RT_REPAINT_INTERVAL,
+        # and only the cards and table whose content changed since the last repaint are re-sent
+        if dirty_symbols and time() - last_repaint >= RT_REPAINT_INTERVAL:
+            repaint_symbols, dirty_symbols = dirty_symbols, set()
+            last_repaint = time()
+
+            # Update metric cards from the hub's shared rolling statistics
+            for symbol in repaint_symbols:
+                current_price = latest_rows[symbol]['Price']
+                stats = hub.statistics.snapshot(symbol)
+                window = stats.get(RT_STATS_WINDOW, {})
+                if not window.get('count'):
+                    continue
+                returns = " · ".join(
+                    f"{name} {stats[name]['return'] * 100:+.3f}%"
+                    for name in stats if stats[name].get('count')
                 )
-                st.session_state.lowest_prices[symbol] = min(
-                    st.session_state.lowest_prices[symbol],
-                    price if price > 0 else float('inf')
+                card = f"""
+                    <div class="compact-metric-card">
+                        <h3>{symbol}</h3>
+                        <p class="current-price">Current: {current_price:.4f}</p>
+                        <p style="color: #00ff00;">{RT_STATS_WINDOW} High: {window['high']:.4f}</p>
+                        <p style="color: #ff4444;">{RT_STATS_WINDOW} Low: {window['low']:.4f}</p>
+                        <p>Mean: {window['mean']:.4f} · σ {window['stdev']:.5f} · {window['count']} ticks</p>
+                        <p>{returns}</p>
+                    </div>
+                """
+                if frame.changed(('card', symbol), card, kind='card'):
+                    metric_cards[symbol].markdown(card, unsafe_allow_html=True)
+
+            # The table is only rebuilt and re-sent when one of its rows received a tick
+            if frame.changed('table', tuple(row_updates.values()), kind='table'):
+                # Copies in fixed symbol order (hub rows are shared across sessions); the trend
+                # is copied out of the symbol's ring buffer, which the hub thread keeps writing to
+                st.session_state.rt_table_data = pd.DataFrame(
+                    [
+                        {
+                            'Symbol': symbol,
+                            'Trend': np.array(row['Trend'].view()),
+                            'Price': row['Price'],
+                            'Change': row['Change'],
+                            '% Change': f"{row['% Change']:.2f}%",
+                        }
+                        for symbol in PREDEFINED_SYMBOLS
+                        for row in [latest_rows.get(symbol)] if row is not None
+                    ],
+                    columns=['Symbol', 'Trend', 'Price', 'Change', '% Change'],
                 )
-            
-            # Update metric cards
-            for item in filtered_data:
-                symbol = item['Symbol']
-                current_price = item['Price']
-                highest_price = st.session_state.highest_prices[symbol]
-                lowest_price = st.session_state.lowest_prices[symbol]
-                
-                with metric_cards[symbol]:
-                    st.markdown(f"""
-                        <div class="compact-metric-card">
-                            <h3>{symbol}</h3>
-                            <p class="current-price">Current: {current_price:.4f}</p>
-                            <p style="color: #00ff00;">High: {highest_price:.4f}</p>
-                            <p style="color: #ff4444;">Low: {lowest_price:.4f}</p>
-                        </div>
-                    """, unsafe_allow_html=True)
-            
-            # Update data table
-            with data_placeholder.container():
-                st.markdown("### 📈 Live Price Updates")
-                st.dataframe(
+                if frame.changed('table_heading', True, kind='heading'):
+                    table_heading.markdown("### 📈 Live Price Updates")
+                data_placeholder.dataframe(
                     st.session_state.rt_table_data,
                     column_config={
                         "Symbol": st.column_config.TextColumn("Symbol", width=30),
@@ -257,17 +286,96 @@ def display_real_time_data():
                     hide_index=True,
                     use_container_width=True
                 )
-            
-        sleep(1)
+            metrics.observe('forex_tick_to_render_seconds', time() - pending_since)
+
+# Real-time ticks rolled into 1s/1m/1h bars on top of the downloaded history
+@st.cache_resource
+def get_live_history():
+    return LiveHistory()
+
+# Stores of the historical feeds that have finished loading, with live bars layered on top;
+# live rows that have left every time range are evicted first
+def get_loaded_stores(loader, live):
+    live.evict()
+    return {
+        feed: live.layered(feed, loader.result(feed).store) if loader.ready(feed) and loader.result(feed).store is not None else None
+        for feed in HISTORICAL_FEEDS
+    }
+
+# Snapshot generations of the loaded feeds; changes whenever one is refreshed
+def get_loaded_data_version(loader):
+    return tuple(loader.result(feed).generation if loader.ready(feed) else None for feed in HISTORICAL_FEEDS)
+
+# Every TimeRange view per preloaded symbol, rebuilt in the background as data and the clock move;
+# other symbols are computed on request
+@st.cache_resource
+def get_time_range_views():
+    loader = get_history_loader()
+    live = get_live_history()
+    return TimeRangeViews(
+        lambda: get_loaded_stores(loader, live), lambda: get_loaded_data_version(loader), refresh_interval=15.0,
+        symbols=get_symbol_registry().preload,
+    ).start()
+
+# Cap on the number of points sent to the browser per chart
+CHART_MAX_POINTS = 2000
+
+# LTTB-downsampled slice of a range's series, cached per (range, symbol, zoom window, size, data version)
+@st.cache_data(max_entries=128, show_spinner=False)
+def get_chart_series(range_value, symbol, start, end, max_points, data_version, _timestamps, _prices):
+    lo = np.searchsorted(_timestamps, start, side='left')
+    hi = np.searchsorted(_timestamps, end, side='right')
+    return downsample(_timestamps[lo:hi], _prices[lo:hi], max_points)
+
+# Candle count the default interval aims for, and the most candles sent per chart
+CHART_TARGET_CANDLES = 500
+CHART_MAX_CANDLES = CHART_MAX_POINTS
+
+# Process-wide candles per (range, symbol, interval), extended as the range's series grows
+@st.cache_resource
+def get_candle_cache():
+    return CandleCache(max_entries=64)
+
+# Process-wide LRU of built figures, shared by all sessions
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache(max_entries=64)
+
+# Build a figure on a cache miss, recording how long it took
+def build_figure_timed(stage, build, *args):
+    with metrics.timed('forex_figure_build_seconds', stage=stage):
+        return build(*args)
+
+# Carry a zoom selection over to a range whose bounds moved (the rolling ranges are rebuilt
+# every refresh): an edge left at the old bound follows the new one, any other edge is clamped
+def keep_zoom(selection, previous_bounds, bounds):
+    if selection is None or previous_bounds is None:
+        return bounds
+    lo, hi = bounds
+    start = lo if selection[0] <= previous_bounds[0] else min(max(selection[0], lo), hi)
+    end = hi if selection[1] >= previous_bounds[1] else min(max(selection[1], lo), hi)
+    return (start, end) if start < end else bounds
+
+# Per-feed download progress; reruns the page once every feed the range needs has loaded
+@st.fragment(run_every=1.0)
+def display_loading_progress(loader, feeds):
+    if all(loader.ready(feed) for feed in feeds):
+        st.rerun()
+
+    st.info("⏳ Loading historical data for this range...")
+    for feed in feeds:
+        progress = loader.progress(feed)
+        error = loader.error(feed)
+        if error is not None:
+            st.error(f"{feed}: failed to load ({error})")
+        else:
+            st.caption(f"{feed}: {progress.bytes / 1e6:.1f} MB received, {progress.rows:,} rows parsed in {progress.elapsed:.0f}s")
+
 def display_historical_data():
     st.markdown("### 🔍 Filters")
     col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
 
-    CURRENCY_PAIRS = {
-        'EUR/USD': 'EURUSD',
-        'USD/CHF': 'USDCHF',
-        'GBP/USD': 'GBPUSD'
-    }
+    CURRENCY_PAIRS = get_symbol_registry().pairs()
 
     with col1:
         option = st.selectbox(
@@ -279,7 +387,7 @@ def display_historical_data():
     with col2:
         chart_type = st.selectbox(
             "📊 Chart Type",
-            ["Line"],
+            ["Line", "Candlestick"],
             key="chart_type"
         )
 
@@ -300,114 +408,262 @@ def display_historical_data():
     st.divider()
 
     # Get historical data
-    parsed_hist1s_data, parsed_hist1m_data, parsed_hist1h_data = fetch_all_historical_resource_once()
+    loader = get_history_loader()
     
     selected_symbol = CURRENCY_PAIRS[selected_pair]
     selected_time_range = next((time_range for time_range in TimeRange if time_range.value == option), None)
+    required_feeds = TIME_RANGE_FEEDS[selected_time_range]
+
+    # Render as soon as the feeds backing this range are loaded, whatever the others are doing
+    if not all(loader.ready(feed) for feed in required_feeds):
+        display_loading_progress(loader, required_feeds)
+        return
 
-    time_range_data = []
-    if parsed_hist1s_data is not None and parsed_hist1m_data is not None and parsed_hist1h_data is not None:
-        time_range_data = get_time_specific_data(selected_time_range.value, parsed_hist1s_data, parsed_hist1m_data, parsed_hist1h_data)
+    # Served from the background-built view when available, computed on the spot otherwise
+    views = get_time_range_views()
+    view = views.get(selected_time_range, selected_symbol)
+    if view is not None:
+        timestamps, prices = view
+        data_version = ('view', views.version(selected_time_range))
+    else:
+        stores = get_loaded_stores(loader, get_live_history())
+        timestamps, prices = EMPTY_RESULT
+        if all(stores[feed] is not None for feed in required_feeds):
+            timestamps, prices = get_time_specific_data(
+                selected_time_range.value, selected_symbol,
+                stores.get('hist1s'), stores.get('hist1m'), stores.get('hist1h'),
+            )
+        data_version = (tuple(loader.result(feed).generation for feed in required_feeds), int(time() // 60))
 
     st.subheader(f"Historical Data for {selected_time_range.value}")
 
-    if time_range_data:
-        df_time_range = pd.DataFrame(time_range_data)
-        df_time_range = df_time_range[df_time_range['Symbol'] == selected_symbol]
+    if len(timestamps):
+        # Zooming in re-downsamples the narrower window, so detail increases as the window shrinks
+        # The selection lives in session state so a view rebuild that moves the bounds keeps it
+        zoom_start, zoom_end = from_epoch(timestamps[0]), from_epoch(timestamps[-1])
+        if zoom_end > zoom_start:
+            zoom_key = f"zoom_{selected_time_range.name}_{selected_symbol}"
+            bounds_key = f"{zoom_key}_bounds"
+            st.session_state[zoom_key] = keep_zoom(
+                st.session_state.get(zoom_key), st.session_state.get(bounds_key), (zoom_start, zoom_end)
+            )
+            st.session_state[bounds_key] = (zoom_start, zoom_end)
+            zoom_start, zoom_end = st.slider(
+                "🔎 Zoom",
+                min_value=zoom_start,
+                max_value=zoom_end,
+                step=timedelta(seconds=max(60, int((zoom_end - zoom_start).total_seconds()) // 1000)),
+                format="YYYY-MM-DD HH:mm",
+                key=zoom_key,
+            )
 
         st.subheader(f"📈 {selected_time_range.value}")
-
-        if 'Time' in df_time_range.columns and 'Last Price' in df_time_range.columns:
-            # Apply chart style
-            if chart_style == "Trading View":
-                template = "plotly_dark"
-                bg_color = '#131722'
-                grid_color = 'rgba(42, 46, 57, 0.2)'
-            elif chart_style == "Minimal":
-                template = "none"
-                bg_color = 'rgba(0,0,0,0)'
-                grid_color = 'rgba(128,128,128,0.1)'
-            else:
-                template = "plotly_dark"
-                bg_color = 'rgba(0,0,0,0)'
-                grid_color = 'rgba(128,128,128,0.1)'
-
-            if chart_type == "Line":
-                fig = px.line(
-                    df_time_range,
-                    x='Time',
-                    y='Last Price',
-                    title=f"{selected_time_range.value}",
-                    template=template
-                )
-                
-                # Remove duplicate traces
-                fig.data = [fig.data[0]]
-                
-                n_ticks = 10  # Desired maximum number of ticks
-                indices = np.linspace(0, len(df_time_range) - 1, n_ticks, dtype=int)
-                x_axis_labels = df_time_range['Time'].iloc[indices]
-                fig.update_layout(xaxis_tickvals=x_axis_labels.tolist())
-
-                # Update line appearance
-                fig.update_traces(
-                    line=dict(width=1.5, color='#0066FF'),
-                    showlegend=False
-                )
-
-            # Common chart updates
-            fig.update_layout(
-                xaxis_title='Time',
-                yaxis_title='Price',
-                hovermode='x unified',
-                plot_bgcolor=bg_color,
-                paper_bgcolor=bg_color,
-                font=dict(color='white'),
-                margin=dict(t=50, b=50, l=50, r=50),
-                showlegend=False
+        window_start, window_end = to_epoch(zoom_start), to_epoch(zoom_end)
+        figure_cache = get_figure_cache()
+
+        if chart_type == "Candlestick":
+            # Candles are never finer than the bars of the range's primary feed
+            source_interval = FEED_INTERVALS[required_feeds[0]]
+            intervals = [name for name, seconds in CANDLE_INTERVALS.items() if seconds >= source_interval]
+            default_interval = pick_interval(window_end - window_start, source_interval, CHART_TARGET_CANDLES)
+            # The interval follows the zoom until the user picks one; their pick is kept from then on
+            interval_key = f"candle_interval_{selected_time_range.name}"
+            auto_key = f"{interval_key}_auto"
+            picked = st.session_state.get(interval_key)
+            if picked not in intervals or picked == st.session_state.get(auto_key):
+                st.session_state[interval_key] = default_interval
+            st.session_state[auto_key] = default_interval
+            candle_interval = st.selectbox(
+                "🕯️ Candle Interval",
+                intervals,
+                key=interval_key
             )
 
-            # Update axes
-            fig.update_xaxes(
-                gridcolor=grid_color,
-                zeroline=False,
-                showline=False,
-                linewidth=1,
-                linecolor='rgba(255,255,255,0.2)',
-                mirror=True
+            # Snapshot generations identify the downloaded history under the series; a new one rebuilds the candles
+            source = tuple(loader.result(feed).generation for feed in required_feeds)
+            candles = get_candle_cache().candles(
+                (selected_time_range.name, selected_symbol), candle_interval, source, timestamps, prices
+            )
+            candles = window_candles(candles, CANDLE_INTERVALS[candle_interval], window_start, window_end)
+            if len(candles.timestamps) > CHART_MAX_CANDLES:
+                st.caption(f"Showing the latest {CHART_MAX_CANDLES:,} of {len(candles.timestamps):,} candles; zoom in or pick a wider interval to see the rest.")
+                candles = OHLC(*(field[-CHART_MAX_CANDLES:] for field in candles))
+
+            has_points = len(candles.timestamps) > 0
+            base_key = (selected_symbol, selected_time_range.name, chart_type, candle_interval, window_start, window_end, data_version)
+            build_base = lambda: build_figure_timed(
+                'candlestick', build_candlestick_figure, candles, f"{selected_time_range.value}"
+            )
+        else:
+            chart_ts, chart_prices = get_chart_series(
+                selected_time_range.value, selected_symbol, window_start, window_end,
+                CHART_MAX_POINTS, data_version, timestamps, prices,
             )
-            
-            fig.update_yaxes(
-                gridcolor=grid_color,
-                zeroline=False,
-                showline=False,
-                linewidth=1,
-                linecolor='rgba(255,255,255,0.2)',
-                mirror=True
+            has_points = len(chart_ts) > 0
+            base_key = (selected_symbol, selected_time_range.name, chart_type, window_start, window_end, data_version)
+            build_base = lambda: build_figure_timed(
+                'line', build_line_figure, chart_ts, chart_prices, f"{selected_time_range.value}"
             )
 
-            # Add range selector
-            fig.update_xaxes(
-                rangeslider=dict(visible=False),
-                rangeselector=dict(
-                    buttons=list([
-                        dict(count=1, label="1d", step="day", stepmode="backward"),
-                        dict(count=7, label="1w", step="day", stepmode="backward"),
-                        dict(count=1, label="1m", step="month", stepmode="backward"),
-                        dict(step="all")
-                    ]),
-                    bgcolor=bg_color,
-                    activecolor='#1e88e5'
-                )
+        # A zoom window can fall entirely inside a gap (e.g. a weekend)
+        if not has_points:
+            st.warning("No data in the selected zoom window; widen it to see prices.")
+        else:
+            # Base figures are cached per data; a style change only re-themes a cached base figure
+            base_fig = figure_cache.get_or_build(base_key, build_base)
+            fig = figure_cache.get_or_build(
+                base_key + (chart_style,), lambda: build_figure_timed('style', apply_chart_style, base_fig, chart_style)
             )
 
             st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.warning("No data available for the selected time range.")
+    else:
+        st.warning("No data available for the selected time range.")
+
+    with st.expander("⏱️ View build stats"):
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    'Time Range': stats.time_range.value,
+                    'Build (ms)': round(stats.seconds * 1000, 1),
+                    'Symbols': stats.symbols,
+                    'Rows': stats.rows,
+                    'Size (KB)': round(stats.nbytes / 1024, 1),
+                }
+                for stats in views.stats()
+            ]),
+            hide_index=True
+        )
+
+# Grid steps per range and rolling correlation windows (in grid steps) of the cross-symbol analytics
+CROSS_MAX_POINTS = 1000
+CROSS_WINDOWS = [30, 60, 120, 240]
+
+# Cross-symbol analytics of a range, cached per (range, window, data version)
+@st.cache_data(max_entries=32, show_spinner=False)
+def get_cross_analytics(range_value, window, data_version, _series):
+    with metrics.timed('forex_cross_analytics_seconds', time_range=range_value):
+        return compute_cross_analytics(_series, CROSS_MAX_POINTS, window)
+
+def display_cross_analytics():
+    st.markdown("### 🧮 Cross-Symbol Analytics")
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        option = st.selectbox(
+            "📅 Time Range",
+            [time_range.value for time_range in TimeRange.__members__.values()],
+            key="cross_time_range"
+        )
+
+    with col2:
+        window = st.selectbox(
+            "🪟 Rolling Window (grid steps)",
+            CROSS_WINDOWS,
+            index=1,
+            key="cross_window"
+        )
+
+    st.divider()
+
+    loader = get_history_loader()
+    selected_time_range = TimeRange(option)
+    required_feeds = TIME_RANGE_FEEDS[selected_time_range]
+    if not all(loader.ready(feed) for feed in required_feeds):
+        display_loading_progress(loader, required_feeds)
+        return
+
+    stores = get_loaded_stores(loader, get_live_history())
+    if any(stores[feed] is None for feed in required_feeds):
+        st.warning("No data available for the selected time range.")
+        return
+
+    # Every symbol's series for the range, from the background-built views where available
+    views = get_time_range_views()
+    symbols = sorted(set().union(*(stores[feed].symbols for feed in required_feeds)) & get_symbol_registry().accepted)
+    series = {}
+    for symbol in symbols:
+        view = views.get(selected_time_range, symbol)
+        if view is None:
+            view = get_time_specific_data(
+                selected_time_range.value, symbol,
+                stores.get('hist1s'), stores.get('hist1m'), stores.get('hist1h'),
+            )
+        series[symbol] = view
+    if all(views.get(selected_time_range, symbol) is not None for symbol in symbols):
+        data_version = ('view', views.version(selected_time_range))
+    else:
+        data_version = (tuple(loader.result(feed).generation for feed in required_feeds), int(time() // 60))
+
+    analytics = get_cross_analytics(selected_time_range.value, window, data_version, series)
+    if len(analytics.symbols) < 2 or len(analytics.timestamps) < 2:
+        st.info("Cross-symbol analytics need at least two symbols with data in the selected time range.")
+        return
+
+    chart_style = st.session_state.get("chart_style", "Default")
+    figure_cache = get_figure_cache()
+    base_key = ('cross', selected_time_range.name, window, data_version)
+
+    def styled(kind, build, *key):
+        figure_key = base_key + (kind,) + key
+        base_fig = figure_cache.get_or_build(figure_key, lambda: build_figure_timed(kind, build))
+        return figure_cache.get_or_build(
+            figure_key + (chart_style,), lambda: build_figure_timed('style', apply_chart_style, base_fig, chart_style)
+        )
+
+    st.dataframe(
+        pd.DataFrame({
+            'Symbol': analytics.symbols,
+            'Last Price': analytics.prices[-1],
+            'Return (%)': np.round(analytics.performance[-1] * 100, 3),
+            'Volatility per step (%)': np.round(np.nanstd(analytics.returns, axis=0) * 100, 4),
+        }),
+        hide_index=True,
+        use_container_width=True
+    )
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.plotly_chart(styled('correlation', lambda: build_heatmap_figure(
+            analytics.correlation, analytics.symbols, "Return correlation", zmin=-1, zmax=1
+        )), use_container_width=True)
+    with col2:
+        spreads = spread_matrix(analytics) * 100
+        limit = float(np.nanmax(np.abs(spreads))) or 1.0
+        st.plotly_chart(styled('spreads', lambda: build_heatmap_figure(
+            spreads, analytics.symbols, "Spread: row minus column return (%)", zmin=-limit, zmax=limit
+        )), use_container_width=True)
+
+    st.plotly_chart(styled('performance', lambda: build_multi_line_figure(
+        analytics.timestamps, analytics.performance * 100, analytics.symbols,
+        f"Return since range start (%), {selected_time_range.value}", yaxis_title='Return (%)'
+    )), use_container_width=True)
+
+    # Rolling correlation and spread of one pair over the range
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        symbol_a = st.selectbox("Symbol A", analytics.symbols, index=0, key="cross_symbol_a")
+    with col2:
+        symbol_b = st.selectbox("Symbol B", analytics.symbols, index=1, key="cross_symbol_b")
+    a, b = analytics.symbols.index(symbol_a), analytics.symbols.index(symbol_b)
+    if len(analytics.rolling_timestamps):
+        st.plotly_chart(styled('pair', lambda: build_multi_line_figure(
+            analytics.rolling_timestamps,
+            np.column_stack((
+                analytics.rolling_correlation[:, a, b],
+                spread_series(analytics, symbol_a, symbol_b)[window:] * 100,
+            )),
+            [f"Rolling correlation ({window} steps)", "Spread (%)"],
+            f"{symbol_a} / {symbol_b}",
+        ), symbol_a, symbol_b), use_container_width=True)
+    else:
+        st.info(f"The selected time range has fewer than {window} grid steps; pick a shorter rolling window.")
 
 def main():
     st.set_page_config(layout="wide", page_title="Currency App", page_icon="📈")
 
+    # Prometheus text on http://127.0.0.1:$FOREX_METRICS_PORT/metrics when the port is set
+    start_metrics_server()
+
     # Apply styling
     st.markdown("""
         <style>
@@ -479,12 +735,15 @@ def main():
     #st.divider()
 
     # Create tabs
-    tab1, tab2 = st.tabs(["📈 Historical Data", "🔄 Real-Time Data"])
+    tab1, tab2, tab3 = st.tabs(["📈 Historical Data", "🔄 Real-Time Data", "🧮 Cross-Symbol Analytics"])
 
-    # Handle each tab separately
+    # Handle each tab separately; the real-time tab goes last because it keeps the script running
     with tab1:
         display_historical_data()
 
+    with tab3:
+        display_cross_analytics()
+
     with tab2:
         if 'rt_update_thread' not in st.session_state:
             st.session_state.rt_update_thread = None
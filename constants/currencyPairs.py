@@ -0,0 +1,8 @@
+__all__ = ['DEFAULT_CURRENCY_PAIRS']
+
+# Symbols shown (and preloaded) when no universe is configured: display name -> feed symbol
+DEFAULT_CURRENCY_PAIRS = {
+  'EUR/USD': 'EURUSD',
+  'USD/CHF': 'USDCHF',
+  'GBP/USD': 'GBPUSD',
+}
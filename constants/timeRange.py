@@ -1,6 +1,6 @@
 from enum import Enum
 
-__all__ = ['TimeRange']
+__all__ = ['TIME_RANGE_FEEDS', 'TimeRange']
 
 class TimeRange(Enum):
   LAST_YEAR_HOURLY = "Last year"
@@ -16,3 +16,20 @@ class TimeRange(Enum):
   TODAY_SECOND = "Today"
   LAST_12HR_SECOND = "Last 12hr"
   LAST_24HR_SECOND = "Last 24hr"
+
+# Historical feeds each range is built from (hourly ranges fill gaps from minute data)
+TIME_RANGE_FEEDS = {
+  TimeRange.LAST_YEAR_HOURLY: ('hist1h', 'hist1m'),
+  TimeRange.CURRENT_YEAR_HOURLY: ('hist1h', 'hist1m'),
+  TimeRange.CURRENT_YEAR_Q1_HOURLY: ('hist1h', 'hist1m'),
+  TimeRange.CURRENT_YEAR_Q2_HOURLY: ('hist1h', 'hist1m'),
+  TimeRange.CURRENT_YEAR_Q3_HOURLY: ('hist1h', 'hist1m'),
+  TimeRange.CURRENT_YEAR_Q4_HOURLY: ('hist1h', 'hist1m'),
+  TimeRange.LAST_6_MONTHS_HOURLY: ('hist1h',),
+  TimeRange.LAST_MONTH_MINUTE: ('hist1m',),
+  TimeRange.LAST_WEEK_MINUTE: ('hist1m',),
+  TimeRange.YESTERDAY_SECOND: ('hist1s',),
+  TimeRange.TODAY_SECOND: ('hist1s',),
+  TimeRange.LAST_12HR_SECOND: ('hist1s',),
+  TimeRange.LAST_24HR_SECOND: ('hist1s',),
+}
@@ -0,0 +1,144 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.metrics import metrics
+from utils.resample import OHLC, resample
+
+# Selectable candle widths in seconds
+CANDLE_INTERVALS = {'1m': 60, '5m': 300, '15m': 900, '1h': 3600, '4h': 4 * 3600, '1d': 86400}
+
+EMPTY_CANDLES = resample(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64), 60, how='ohlc')
+
+def _concat(left, right):
+    return OHLC(*(np.concatenate((a, b)) for a, b in zip(left, right)))
+
+def _slice(bars, lo, hi=None):
+    return OHLC(*(field[lo:hi] for field in bars))
+
+# Smallest interval, no finer than the source bars, that keeps `span` seconds under max_candles
+def pick_interval(span, source_interval, max_candles):
+    usable = [name for name, seconds in CANDLE_INTERVALS.items() if seconds >= source_interval]
+    for name in usable:
+        if span / CANDLE_INTERVALS[name] <= max_candles:
+            return name
+    return usable[-1] if usable else list(CANDLE_INTERVALS)[-1]
+
+# OHLC candles of one sorted series at a fixed interval, folded in as the series grows.
+# Tracks the first and last point it consumed so a longer copy of the series only costs its new tail.
+class CandleSeries:
+    def __init__(self, interval):
+        self.interval = interval
+        self.reset()
+
+    def reset(self):
+        self.bars = EMPTY_CANDLES
+        self.first_ts = None
+        self.last_ts = None
+        self.consumed = 0
+
+    def __len__(self):
+        return len(self.bars.timestamps)
+
+    # Fold sorted points newer than the last consumed one; a point in the open candle updates it in place
+    def extend(self, timestamps, prices):
+        if not len(timestamps):
+            return
+        new = resample(timestamps, prices, self.interval, how='ohlc')
+        if len(self) and new.timestamps[0] == self.bars.timestamps[-1]:
+            last = len(self) - 1
+            merged = OHLC(
+                new.timestamps[:1],
+                self.bars.open[last:],
+                np.maximum(self.bars.high[last:], new.high[:1]),
+                np.minimum(self.bars.low[last:], new.low[:1]),
+                new.close[:1],
+                self.bars.count[last:] + new.count[:1],
+            )
+            self.bars = _concat(_concat(_slice(self.bars, 0, last), merged), _slice(new, 1))
+        else:
+            self.bars = _concat(self.bars, new)
+        if self.first_ts is None:
+            self.first_ts = int(timestamps[0])
+        self.last_ts = int(timestamps[-1])
+        self.consumed += len(timestamps)
+
+    # The series' window moved forward: drop candles before its new start and rebuild the
+    # (now partial) first candle from the series itself
+    def roll(self, timestamps, prices):
+        first_end = int(timestamps[0]) // self.interval * self.interval + self.interval
+        keep = np.searchsorted(self.bars.timestamps, first_end, side='left')
+        head_end = np.searchsorted(timestamps, first_end, side='left')
+        head = resample(timestamps[:head_end], prices[:head_end], self.interval, how='ohlc')
+        self.bars = _concat(head, _slice(self.bars, keep))
+        self.first_ts = int(timestamps[0])
+        self.consumed = int(np.searchsorted(timestamps, self.last_ts, side='right'))
+
+    # Rebuild the open (last) candle from every point of its bucket, then fold the newer points.
+    # Live bars are rewritten in place under the same timestamp, so the points the open candle
+    # already consumed may have changed since.
+    def refold(self, timestamps, prices):
+        start = int(np.searchsorted(timestamps, self.bars.timestamps[-1], side='left'))
+        self.bars = _slice(self.bars, 0, len(self) - 1)
+        self.consumed = start
+        self.extend(timestamps[start:], prices[start:])
+
+    def window(self, start, end):
+        return window_candles(self.bars, self.interval, start, end)
+
+# Candles of width `interval` overlapping [start, end]
+def window_candles(bars, interval, start, end):
+    lo = np.searchsorted(bars.timestamps, start // interval * interval, side='left')
+    hi = np.searchsorted(bars.timestamps, end, side='right')
+    return _slice(bars, lo, hi)
+
+# Brings a CandleSeries up to date with the current copy of its series; returns how
+def sync_candles(candles, timestamps, prices):
+    consumed = candles.consumed
+    if not consumed:
+        candles.extend(timestamps, prices)
+        return 'build'
+    if len(timestamps) >= consumed and timestamps[0] == candles.first_ts and timestamps[consumed - 1] == candles.last_ts:
+        candles.refold(timestamps, prices)
+        return 'extend'
+    first_end = int(timestamps[0]) // candles.interval * candles.interval + candles.interval if len(timestamps) else None
+    position = np.searchsorted(timestamps, candles.last_ts, side='left')
+    if (
+        len(timestamps) and timestamps[0] > candles.first_ts and candles.last_ts >= first_end
+        and position < len(timestamps) and timestamps[position] == candles.last_ts
+    ):
+        candles.roll(timestamps, prices)
+        candles.refold(timestamps, prices)
+        return 'roll'
+    candles.reset()
+    candles.extend(timestamps, prices)
+    return 'build'
+
+# Process-wide LRU of CandleSeries per (key, interval). `source` identifies the immutable history
+# behind a series (e.g. snapshot generations); when it changes the candles are rebuilt from scratch.
+class CandleCache:
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def candles(self, key, interval, source, timestamps, prices):
+        cache_key = (key, interval)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None or entry[0] != source:
+                entry = self._entries[cache_key] = (source, CandleSeries(CANDLE_INTERVALS[interval]), threading.Lock())
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        _, candles, series_lock = entry
+        with series_lock:
+            mode = sync_candles(candles, timestamps, prices)
+            metrics.inc('forex_candle_syncs_total', mode=mode, interval=interval)
+            return candles.bars
+
+__all__ = ['CANDLE_INTERVALS', 'CandleCache', 'CandleSeries', 'EMPTY_CANDLES', 'pick_interval', 'sync_candles', 'window_candles']
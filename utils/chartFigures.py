@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+CHART_STYLES = {
+    "Default": dict(template="plotly_dark", bg_color='rgba(0,0,0,0)', grid_color='rgba(128,128,128,0.1)'),
+    "Trading View": dict(template="plotly_dark", bg_color='#131722', grid_color='rgba(42, 46, 57, 0.2)'),
+    "Minimal": dict(template="none", bg_color='rgba(0,0,0,0)', grid_color='rgba(128,128,128,0.1)'),
+}
+
+# Shared axes, ticks and range selector of the price charts
+def _layout_price_figure(fig, times, title):
+    n_ticks = 10  # Desired maximum number of ticks
+    indices = np.linspace(0, len(times) - 1, n_ticks, dtype=int)
+
+    fig.update_layout(
+        title=title,
+        xaxis_title='Time',
+        yaxis_title='Price',
+        xaxis_tickvals=times[indices].tolist(),
+        hovermode='x unified',
+        font=dict(color='white'),
+        margin=dict(t=50, b=50, l=50, r=50),
+        showlegend=False
+    )
+
+    # Update axes
+    for update_axes in (fig.update_xaxes, fig.update_yaxes):
+        update_axes(
+            zeroline=False,
+            showline=False,
+            linewidth=1,
+            linecolor='rgba(255,255,255,0.2)',
+            mirror=True
+        )
+
+    # Add range selector
+    fig.update_xaxes(
+        rangeslider=dict(visible=False),
+        rangeselector=dict(
+            buttons=list([
+                dict(count=1, label="1d", step="day", stepmode="backward"),
+                dict(count=7, label="1w", step="day", stepmode="backward"),
+                dict(count=1, label="1m", step="month", stepmode="backward"),
+                dict(step="all")
+            ]),
+            activecolor='#1e88e5'
+        )
+    )
+    return fig
+
+# Style-independent line figure for a (downsampled) series
+def build_line_figure(chart_ts, chart_prices, title):
+    times = pd.to_datetime(chart_ts, unit='s')
+    fig = go.Figure(go.Scatter(
+        x=times,
+        y=chart_prices,
+        mode='lines',
+        line=dict(width=1.5, color='#0066FF'),
+        hovertemplate='Time=%{x}<br>Last Price=%{y}<extra></extra>',
+        showlegend=False
+    ))
+    return _layout_price_figure(fig, times, title)
+
+# Style-independent candlestick figure for resample.OHLC candles
+def build_candlestick_figure(candles, title):
+    times = pd.to_datetime(candles.timestamps, unit='s')
+    fig = go.Figure(go.Candlestick(
+        x=times,
+        open=candles.open,
+        high=candles.high,
+        low=candles.low,
+        close=candles.close,
+        increasing_line_color='#26a69a',
+        decreasing_line_color='#ef5350',
+        showlegend=False
+    ))
+    return _layout_price_figure(fig, times, title)
+
+# Symbol-by-symbol matrix (correlations, spreads) as an annotated heatmap
+def build_heatmap_figure(matrix, symbols, title, zmin=None, zmax=None, colorscale='RdBu', text_format='.2f'):
+    fig = go.Figure(go.Heatmap(
+        z=matrix,
+        x=symbols,
+        y=symbols,
+        zmin=zmin,
+        zmax=zmax,
+        colorscale=colorscale,
+        texttemplate=f'%{{z:{text_format}}}' if len(symbols) <= 12 else None,
+        hovertemplate='%{y} / %{x}: %{z:' + text_format + '}<extra></extra>',
+    ))
+    fig.update_layout(
+        title=title,
+        font=dict(color='white'),
+        margin=dict(t=50, b=50, l=50, r=50),
+        yaxis_autorange='reversed',
+    )
+    return fig
+
+# One line per column of `values` against shared timestamps
+def build_multi_line_figure(chart_ts, values, names, title, yaxis_title='Value'):
+    times = pd.to_datetime(chart_ts, unit='s')
+    fig = go.Figure([
+        go.Scatter(x=times, y=values[:, column], mode='lines', line=dict(width=1.2), name=name)
+        for column, name in enumerate(names)
+    ])
+    fig.update_layout(
+        title=title,
+        xaxis_title='Time',
+        yaxis_title=yaxis_title,
+        hovermode='x unified',
+        font=dict(color='white'),
+        margin=dict(t=50, b=50, l=50, r=50),
+    )
+    return fig
+
+# Themed copy of a base figure; only the template and colors change
+def apply_chart_style(base_fig, chart_style):
+    style = CHART_STYLES.get(chart_style, CHART_STYLES["Default"])
+    fig = go.Figure(base_fig)
+    fig.update_layout(
+        template=style['template'],
+        plot_bgcolor=style['bg_color'],
+        paper_bgcolor=style['bg_color'],
+        xaxis_rangeselector_bgcolor=style['bg_color']
+    )
+    fig.update_xaxes(gridcolor=style['grid_color'])
+    fig.update_yaxes(gridcolor=style['grid_color'])
+    return fig
+
+__all__ = [
+    'CHART_STYLES', 'apply_chart_style', 'build_candlestick_figure', 'build_heatmap_figure', 'build_line_figure',
+    'build_multi_line_figure',
+]
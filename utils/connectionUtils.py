@@ -1,13 +1,102 @@
+import logging
+import os
+import threading
+from time import sleep
+
 import paramiko
 
-# Function to establish SSH connection
-def connect_ssh_agent(username): 
-  hostname = "rt1.olsendata.com"
-  port = 22103
-  password = "aar5hvya5"
+# Feed host and credentials; override to point the app at another host (e.g. utils/fakeOlsenServer.py)
+HOSTNAME = os.environ.get("OLSEN_HOST", "rt1.olsendata.com")
+PORT = int(os.environ.get("OLSEN_PORT", "22103"))
+PASSWORD = os.environ.get("OLSEN_PASSWORD", "aar5hvya5")
+
+# Open a fresh authenticated SSH client for one feed user
+def create_ssh_client(hostname, port, username, password):
   ssh = paramiko.SSHClient()
   ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
   ssh.connect(hostname, port, username, password)
-  return ssh.invoke_shell()
+  return ssh
+
+# Keeps one authenticated connection per feed user and multiplexes shell channels over it.
+# The Olsen host picks the feed from the login name, so rt/hist1s/hist1m/hist1h each need
+# their own login; repeated opens of the same feed (refreshes, reconnects) reuse the transport.
+class SSHConnectionPool:
+  def __init__(self, hostname=HOSTNAME, port=PORT, password=PASSWORD, client_factory=create_ssh_client,
+               max_attempts=5, backoff=1.0, max_backoff=30.0):
+    self.hostname = hostname
+    self.port = port
+    self.password = password
+    self.client_factory = client_factory
+    self.max_attempts = max_attempts
+    self.backoff = backoff
+    self.max_backoff = max_backoff
+    self._clients = {}
+    self._locks = {}
+    self._lock = threading.Lock()
+
+  def _user_lock(self, username):
+    with self._lock:
+      return self._locks.setdefault(username, threading.Lock())
+
+  def _is_active(self, client):
+    transport = client.get_transport()
+    return transport is not None and transport.is_active()
+
+  # Connect with exponential backoff between failed attempts
+  def _connect(self, username):
+    delay = self.backoff
+    for attempt in range(1, self.max_attempts + 1):
+      try:
+        return self.client_factory(self.hostname, self.port, username, self.password)
+      except (paramiko.SSHException, OSError) as e:
+        if attempt == self.max_attempts:
+          raise
+        logging.warning(f"SSH connect for {username} failed ({e}); retrying in {delay:.1f}s")
+        sleep(delay)
+        delay = min(delay * 2, self.max_backoff)
+
+  def client(self, username):
+    with self._user_lock(username):
+      client = self._clients.get(username)
+      if client is None or not self._is_active(client):
+        if client is not None:
+          client.close()
+        client = self._connect(username)
+        self._clients[username] = client
+      return client
+
+  # Open a new shell channel for a feed on the pooled connection, reconnecting once if it dropped
+  def open_shell(self, username):
+    try:
+      return self.client(username).invoke_shell()
+    except (paramiko.SSHException, EOFError):
+      self.discard(username)
+      return self.client(username).invoke_shell()
+
+  def discard(self, username):
+    with self._user_lock(username):
+      client = self._clients.pop(username, None)
+    if client is not None:
+      client.close()
+
+  def close(self):
+    for username in list(self._clients):
+      self.discard(username)
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+def get_connection_pool():
+  global _default_pool
+  with _default_pool_lock:
+    if _default_pool is None:
+      _default_pool = SSHConnectionPool()
+    return _default_pool
+
+# Function to establish SSH connection
+def connect_ssh_agent(username):
+  return get_connection_pool().open_shell(username)
 
-__all__ = ['connect_ssh_agent']
+__all__ = [
+  'SSHConnectionPool', 'connect_ssh_agent', 'create_ssh_client', 'get_connection_pool',
+]
@@ -0,0 +1,120 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Every symbol of a range on one time grid. `prices` is (steps, symbols), forward-filled and NaN
+# before a symbol's first price; `returns` are the log returns between grid steps; `performance`
+# is each symbol's log return since its first price; `rolling_correlation[k]` is the return
+# correlation matrix over the `window` steps ending at `rolling_timestamps[k]`.
+CrossAnalytics = namedtuple('CrossAnalytics', [
+    'symbols', 'timestamps', 'prices', 'returns', 'performance',
+    'correlation', 'rolling_timestamps', 'rolling_correlation', 'window',
+])
+
+# Grid step in seconds that fits [start, end] into at most max_points steps, no finer than min_interval
+def grid_interval(start, end, max_points, min_interval=1):
+    return max(min_interval, -(-(int(end) - int(start)) // max_points))
+
+# Carry the last non-NaN value of each column forward
+def forward_fill(values):
+    rows = np.where(np.isnan(values), 0, np.arange(len(values))[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return values[rows, np.arange(values.shape[1])]
+
+# Last price of each symbol in every `interval`-second step of a common grid
+def align_symbols(series, interval):
+    symbols = sorted(symbol for symbol, (timestamps, _) in series.items() if len(timestamps))
+    if not symbols:
+        return [], np.empty(0, dtype=np.int64), np.empty((0, 0))
+    start = min(int(series[symbol][0][0]) for symbol in symbols) // interval * interval
+    end = max(int(series[symbol][0][-1]) for symbol in symbols)
+    grid = start + np.arange((end - start) // interval + 1, dtype=np.int64) * interval
+    prices = np.full((len(grid), len(symbols)), np.nan)
+    for column, symbol in enumerate(symbols):
+        timestamps, values = series[symbol]
+        steps = (timestamps - start) // interval
+        last = np.flatnonzero(np.append(steps[1:] != steps[:-1], True))
+        prices[steps[last], column] = values[last]
+    return symbols, grid, forward_fill(prices)
+
+# Pairwise return correlation, each pair over the steps where both symbols have a return
+def pairwise_correlation(returns):
+    present = np.isfinite(returns).astype(np.float64)
+    values = np.where(present > 0, returns, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        counts = present.T @ present
+        sums = values.T @ present
+        squares = (values * values).T @ present
+        cross = values.T @ values
+        mean_i, mean_j = sums / counts, sums.T / counts
+        covariance = cross / counts - mean_i * mean_j
+        variance_i = squares / counts - mean_i ** 2
+        variance_j = squares.T / counts - mean_j ** 2
+        return covariance / np.sqrt(variance_i * variance_j)
+
+# Correlation matrices over every `window`-step span, from running sums (no per-window loop).
+# A window holding a missing return for a symbol gives NaN for that symbol's pairs.
+def rolling_correlation(returns, window):
+    steps, width = returns.shape
+    if window < 2 or steps < window:
+        return np.empty((0, width, width))
+    missing = ~np.isfinite(returns)
+    values = np.where(missing, 0.0, returns)
+
+    def window_sums(cumulative):
+        zero = np.zeros((1,) + cumulative.shape[1:])
+        cumulative = np.concatenate((zero, cumulative))
+        return cumulative[window:] - cumulative[:-window]
+
+    sums = window_sums(np.cumsum(values, axis=0))
+    squares = window_sums(np.cumsum(values * values, axis=0))
+    cross = window_sums(np.cumsum(values[:, :, None] * values[:, None, :], axis=0))
+    gaps = window_sums(np.cumsum(missing, axis=0))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        covariance = cross - sums[:, :, None] * sums[:, None, :] / window
+        variance = squares - sums * sums / window
+        correlation = covariance / np.sqrt(variance[:, :, None] * variance[:, None, :])
+    incomplete = gaps > 0
+    correlation[incomplete[:, :, None] | incomplete[:, None, :]] = np.nan
+    return correlation
+
+# Align a range's {symbol: (timestamps, prices)} onto a grid of at most max_points steps and
+# compute returns, performance, full-range and rolling correlations in whole-array passes
+def compute_cross_analytics(series, max_points=1000, window=60, min_interval=1):
+    non_empty = [(timestamps, prices) for timestamps, prices in series.values() if len(timestamps)]
+    if not non_empty:
+        interval = min_interval
+    else:
+        start = min(int(timestamps[0]) for timestamps, _ in non_empty)
+        end = max(int(timestamps[-1]) for timestamps, _ in non_empty)
+        interval = grid_interval(start, end, max_points, min_interval)
+    symbols, grid, prices = align_symbols(series, interval)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        log_prices = np.log(prices)
+    returns = np.diff(log_prices, axis=0)
+    first_valid = np.argmax(np.isfinite(log_prices), axis=0) if len(grid) else np.zeros(len(symbols), dtype=int)
+    performance = log_prices - log_prices[first_valid, np.arange(len(symbols))] if len(grid) else log_prices
+    return CrossAnalytics(
+        symbols, grid, prices, returns, performance,
+        pairwise_correlation(returns),
+        grid[window:] if len(grid) > window else np.empty(0, dtype=np.int64),
+        rolling_correlation(returns, window),
+        window,
+    )
+
+# Latest spread of every pair: the difference of their returns since the grid start (i minus j)
+def spread_matrix(analytics):
+    if not len(analytics.timestamps):
+        return np.empty((0, 0))
+    latest = analytics.performance[-1]
+    return latest[:, None] - latest[None, :]
+
+# Spread of one pair over the grid, in log-return units
+def spread_series(analytics, symbol_a, symbol_b):
+    a, b = analytics.symbols.index(symbol_a), analytics.symbols.index(symbol_b)
+    return analytics.performance[:, a] - analytics.performance[:, b]
+
+__all__ = [
+    'CrossAnalytics', 'align_symbols', 'compute_cross_analytics', 'forward_fill', 'grid_interval',
+    'pairwise_correlation', 'rolling_correlation', 'spread_matrix', 'spread_series',
+]
@@ -1,126 +1,401 @@
-from collections import deque
-from datetime import datetime
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
-# Parse Real-Time (rt) data from SSH connection
-def parse_real_time_data(data, historic_data):
-    lines = data.strip().split('\n')
-    table_data = []
-    for line in lines:
+import numpy as np
+
+from utils.metrics import metrics
+from utils.ringBuffer import RingBuffer
+from utils.tickStore import TickStore
+from utils.timestampDecoder import decode_compact_timestamp, decode_dotted_hour, decode_dotted_hours
+
+TREND_LENGTH = 100
+
+# Feed wall-clock epoch of a '!YYYYMMDD,HH:MM:SS' header line
+def parse_header_time(line):
+    date, time = line[1:].split(',')
+    return decode_compact_timestamp(date.strip(), time.strip())
+
+# Feed time of the last valid header among `lines`, or `feed_time` when there is none
+def last_header_time(lines, feed_time=None):
+    for line in reversed(lines):
         if line.startswith('!'):
-            _, timestamp = line.split(',')
-        else:
             try:
-                symbol, last_price, _ = line.split(',')
+                return parse_header_time(line.strip())
             except ValueError:
                 continue
-            change = 0
-            if symbol in historic_data:
-                trend = historic_data[symbol]
-                change = float(last_price) - trend[-1]
-                trend.append(float(last_price))
-                if len(trend) > 100:
-                    trend.popleft()
-                historic_data[symbol] = trend
-            else: 
-                historic_data[symbol] = deque([float(last_price)])
-            table_data.append({
-                'Symbol': symbol,
-                'Price': float(last_price),
-                'Change': change,
-                '% Change': (change / float(last_price)) * 100,
-                'Trend': list(historic_data[symbol]),
-            })
-    return table_data
+    return feed_time
 
-# Parse Historical (hist1s) data from SSH connection
-def parse_hist1s_data(data):
+# Parse Real-Time (rt) data from SSH connection; each symbol's trend lives in a RingBuffer.
+# When `symbols` is given, ticks of other symbols are dropped before their price is parsed.
+# Each row's 'Time' is the feed time of its batch header (`feed_time` until the first header).
+def parse_real_time_data(data, historic_data, trend_length=TREND_LENGTH, symbols=None, feed_time=None):
     lines = data.strip().split('\n')
-    parsed_data = []
-    current_date = None
-    current_timestamp = None
-    
+    table_data = []
+    errors = filtered = 0
     for line in lines:
+        if not line:
+            continue
         if line.startswith('!'):
-            # Parse timestamp line
-            date, time = line[1:].split(',')  # Remove '!' and split
-            current_date = date.strip()
-            time = time.strip().replace('\r', '').replace('\n', '')
-            if len(time.split(':')) == 2:
-                time += ':00'
-            current_timestamp = f"{current_date} {time}"  # Time already includes seconds
-        else:
             try:
-                # Parse data line (symbol, price, ignored)
-                symbol, last_price, _ = line.split(',')
-                if not current_date:
+                feed_time = parse_header_time(line.strip())
+            except ValueError:
+                errors += 1
+            continue
+        try:
+            symbol, last_price, _ = line.split(',')
+            if symbols is not None and symbol not in symbols:
+                filtered += 1
+                continue
+            price = float(last_price)
+        except ValueError:
+            errors += 1
+            continue
+        change = 0
+        trend = historic_data.get(symbol)
+        if trend is None:
+            trend = historic_data[symbol] = RingBuffer(trend_length)
+        else:
+            change = price - trend.last
+        trend.append(price)
+        table_data.append({
+            'Symbol': symbol,
+            'Price': price,
+            'Change': change,
+            '% Change': (change / price) * 100,
+            'Trend': trend,
+            'Time': feed_time,
+        })
+    metrics.inc('forex_parsed_rows_total', len(table_data), feed='rt')
+    metrics.inc('forex_parse_errors_total', errors, feed='rt')
+    metrics.inc('forex_filtered_rows_total', filtered, feed='rt')
+    return table_data
+
+# Reassembles lines from raw SSH byte chunks, holding a partial line until the rest arrives
+class LineBuffer:
+    def __init__(self):
+        self._pending = b''
+
+    def feed(self, chunk):
+        if isinstance(chunk, str):
+            chunk = chunk.encode('ascii', errors='ignore')
+        lines = (self._pending + chunk).split(b'\n')
+        self._pending = lines.pop()
+        return [line.decode('ascii', errors='ignore').strip() for line in lines]
+
+    def flush(self):
+        pending, self._pending = self._pending, b''
+        return [pending.decode('ascii', errors='ignore').strip()] if pending else []
+
+# Split raw SSH byte chunks into lines, carrying a partial line over to the next chunk
+def iter_lines(chunks):
+    if isinstance(chunks, (str, bytes)):
+        chunks = [chunks]
+    buffer = LineBuffer()
+    for chunk in chunks:
+        yield from buffer.feed(chunk)
+    yield from buffer.flush()
+
+# Yield (symbol, epoch, price) rows from '!date,time' blocks (hist1s / hist1m), optionally
+# only for the symbols in `symbols`
+def iter_timestamped_rows(chunks, feed='hist1s', symbols=None):
+    current_ts = None
+    rows = errors = filtered = 0
+    try:
+        for line in iter_lines(chunks):
+            if not line:
+                continue
+            if line.startswith('!'):
+                # Parse timestamp line
+                try:
+                    date, time = line[1:].split(',')  # Remove '!' and split
+                    current_ts = decode_compact_timestamp(date.strip(), time.strip())
+                except ValueError:
+                    errors += 1
+                    current_ts = None
+            else:
+                try:
+                    # Parse data line (symbol, price, ignored)
+                    symbol, last_price, _ = line.split(',')
+                    if current_ts is None:
+                        continue
+                    if symbols is not None and symbol not in symbols:
+                        filtered += 1
+                        continue
+                    price = float(last_price)
+                except ValueError:
+                    errors += 1
+                    continue
+                rows += 1
+                yield symbol, current_ts, price
+    finally:
+        metrics.inc('forex_parsed_rows_total', rows, feed=feed)
+        metrics.inc('forex_parse_errors_total', errors, feed=feed)
+        metrics.inc('forex_filtered_rows_total', filtered, feed=feed)
+
+# Yield (symbol, epoch, price) rows from '#SYMBOL' blocks (hist1h); blocks of symbols
+# outside `symbols` are skipped without parsing their lines
+def iter_symbol_block_rows(chunks, feed='hist1h', symbols=None):
+    current_symbol = None
+    skip_block = False
+    rows = errors = filtered = 0
+    try:
+        for line in iter_lines(chunks):
+            if not line:
+                continue
+            if line.startswith('#'):
+                current_symbol = line[1:].strip()
+                skip_block = symbols is not None and current_symbol not in symbols
+            elif skip_block:
+                filtered += 1
+            else:
+                try:
+                    date, hour, last_price, _ = line.split(',')
+                    if current_symbol is None:
+                        continue
+                    ts = decode_dotted_hour(date, hour)
+                    price = float(last_price)
+                except ValueError:
+                    errors += 1
                     continue
-                parsed_data.append({
-                    'Symbol': symbol,
-                    'Last Price': float(last_price),
-                    'Date': current_date,
-                    'Time': current_timestamp
-                })
+                rows += 1
+                yield current_symbol, ts, price
+    finally:
+        metrics.inc('forex_parsed_rows_total', rows, feed=feed)
+        metrics.inc('forex_parse_errors_total', errors, feed=feed)
+        metrics.inc('forex_filtered_rows_total', filtered, feed=feed)
+
+
+# Decode one '#SYMBOL' block's rows at once; a block holding a malformed row falls back to
+# row-by-row decoding so only that row is dropped
+def _decode_block(dates, hours, prices):
+    try:
+        return decode_dotted_hours(dates, hours), np.asarray(prices, dtype=np.float64), 0
+    except ValueError:
+        timestamps, values = [], []
+        for date, hour, price in zip(dates, hours, prices):
+            try:
+                ts, value = decode_dotted_hour(date, hour), float(price)
             except ValueError:
                 continue
-    
-    return parsed_data
+            timestamps.append(ts)
+            values.append(value)
+        return np.array(timestamps, dtype=np.int64), np.array(values, dtype=np.float64), len(dates) - len(values)
 
-# Parse Historical (hist1m) data from SSH connection
-def parse_hist1m_data(data):
-    lines = data.strip().split('\n')
-    parsed_data = []
-    current_date = None
-    current_timestamp = None
-    
-    for line in lines:
-        if line.startswith('!'):
-            # Parse timestamp line
-            date, time = line[1:].split(',')  # Remove '!' and split
-            current_date = date.strip()
-            time = time.strip().replace('\r', '').replace('\n', '')
-            if len(time.split(':')) == 2:
-                time += ':00'
-            current_timestamp = f"{current_date} {time}"
-        else:
+# Price texts to a float column in one pass; rows with a malformed price are dropped
+def _price_column(timestamps, prices):
+    try:
+        return np.array(timestamps, dtype=np.int64), np.array(prices, dtype=np.float64), 0
+    except ValueError:
+        kept_ts, kept_px = [], []
+        for ts, price in zip(timestamps, prices):
             try:
-                # Parse data line (symbol, price, ignored)
-                symbol, last_price, _ = line.split(',')
-                if not current_date:
-                    continue
-                parsed_data.append({
-                    'Symbol': symbol,
-                    'Last Price': float(last_price),
-                    'Date': current_date,
-                    'Time': current_timestamp
-                })
+                kept_px.append(float(price))
             except ValueError:
                 continue
-    
-    return parsed_data
+            kept_ts.append(ts)
+        return np.array(kept_ts, dtype=np.int64), np.array(kept_px, dtype=np.float64), len(prices) - len(kept_px)
 
+# {symbol: [(timestamps, prices), ...]} to {symbol: (timestamps, prices)}, parts kept in order
+def _concat_columns(parts):
+    return {
+        symbol: (np.concatenate([ts for ts, _ in columns]), np.concatenate([px for _, px in columns]))
+        for symbol, columns in parts.items()
+    }
 
-# Parse Historical (hist1h) data from SSH connection
-def parse_hist1h_data(data):
-    lines = data.strip().split('\n')
-    parsed_data = []
+# Columnar form of iter_timestamped_rows: ({symbol: (timestamps, prices)}, errors, filtered).
+# Every row is buffered as Python objects until the end, so it is only used on the bounded
+# pieces a pool worker parses; the calling thread streams rows into a TickStore instead.
+def _timestamped_columns(chunks, symbols=None):
+    timestamps, prices = {}, {}
+    current_ts = None
+    errors = filtered = 0
+    for line in iter_lines(chunks):
+        if not line:
+            continue
+        if line.startswith('!'):
+            try:
+                date, time = line[1:].split(',')
+                current_ts = decode_compact_timestamp(date.strip(), time.strip())
+            except ValueError:
+                errors += 1
+                current_ts = None
+            continue
+        try:
+            symbol, last_price, _ = line.split(',')
+        except ValueError:
+            errors += 1
+            continue
+        if current_ts is None:
+            continue
+        if symbols is not None and symbol not in symbols:
+            filtered += 1
+            continue
+        column = timestamps.get(symbol)
+        if column is None:
+            column = timestamps[symbol] = []
+            prices[symbol] = []
+        column.append(current_ts)
+        prices[symbol].append(last_price)
+    columns = {}
+    for symbol, column in timestamps.items():
+        ts, px, failed = _price_column(column, prices[symbol])
+        errors += failed
+        if len(ts):
+            columns[symbol] = (ts, px)
+    return columns, errors, filtered
+
+# Columnar form of iter_symbol_block_rows, with each block's timestamps and prices decoded in
+# one NumPy pass instead of per row: ({symbol: (timestamps, prices)}, errors, filtered)
+def _symbol_block_columns(chunks, symbols=None):
+    parts = {}
     current_symbol = None
-    
-    for line in lines:
+    skip_block = False
+    dates, hours, prices = [], [], []
+    errors = filtered = 0
+
+    def flush():
+        nonlocal errors
+        if dates:
+            timestamps, values, failed = _decode_block(dates, hours, prices)
+            errors += failed
+            if len(values):
+                parts.setdefault(current_symbol, []).append((timestamps, values))
+        dates.clear()
+        hours.clear()
+        prices.clear()
+
+    for line in iter_lines(chunks):
+        if not line:
+            continue
         if line.startswith('#'):
+            flush()
             current_symbol = line[1:].strip()
+            skip_block = symbols is not None and current_symbol not in symbols
+        elif skip_block:
+            filtered += 1
         else:
             try:
-                date, timestamp, last_price, _ = line.split(',')
-                timestamp = f"{date} {timestamp}:00:00"
-                parsed_data.append({
-                    'Symbol': current_symbol,
-                    'Last Price': float(last_price),
-                    'Date': date,
-                    'Time': timestamp
-                })
+                date, hour, last_price, _ = line.split(',')
             except ValueError:
+                errors += 1
+                continue
+            if current_symbol is None:
                 continue
-    
-    return parsed_data
+            dates.append(date)
+            hours.append(hour.strip())
+            prices.append(last_price)
+    flush()
+    return _concat_columns(parts), errors, filtered
+
+_COLUMN_PARSERS = {'hist1s': _timestamped_columns, 'hist1m': _timestamped_columns, 'hist1h': _symbol_block_columns}
+
+# Line prefix that starts a block in each feed; payloads are only split where a block starts
+BLOCK_MARKERS = {'hist1s': b'\n!', 'hist1m': b'\n!', 'hist1h': b'\n#'}
+
+# Worker processes for parsing large history payloads (0 or 1 parses in the calling thread)
+PARSE_WORKERS = int(os.environ.get('FOREX_PARSE_WORKERS', '0'))
+
+# Payloads smaller than this are parsed in the calling thread even with workers configured
+PARALLEL_PARSE_MIN_BYTES = 4 * 2**20
+
+# Split a payload into about `parts` pieces, each starting on a block header line
+def split_blocks(data, marker, parts):
+    step = max(1, len(data) // max(1, parts))
+    bounds = [0]
+    for k in range(1, parts):
+        position = data.find(marker, max(bounds[-1], k * step))
+        if position < 0:
+            break
+        bounds.append(position + 1)
+    bounds.append(len(data))
+    return [data[start:end] for start, end in zip(bounds, bounds[1:]) if end > start]
+
+def _parse_part(feed, part, symbols):
+    return _COLUMN_PARSERS[feed](part, symbols)
+
+_parse_pool = None
+_parse_pool_workers = 0
+_parse_pool_lock = threading.Lock()
+
+# Process pool shared by every parse; workers are spawned rather than forked since the
+# calling process runs SSH and Streamlit threads
+def get_parse_pool(workers=PARSE_WORKERS):
+    global _parse_pool, _parse_pool_workers
+    with _parse_pool_lock:
+        if _parse_pool is None or _parse_pool_workers != workers:
+            if _parse_pool is not None:
+                _parse_pool.shutdown(wait=False)
+            _parse_pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+            _parse_pool_workers = workers
+        return _parse_pool
+
+def _join_chunks(chunks):
+    if isinstance(chunks, bytes):
+        return chunks
+    if isinstance(chunks, str):
+        return chunks.encode('ascii', errors='ignore')
+    return b''.join(chunk.encode('ascii', errors='ignore') if isinstance(chunk, str) else chunk for chunk in chunks)
+
+def _fill_store(rows):
+    store = TickStore()
+    for symbol, ts, price in rows:
+        store.append(symbol, ts, price)
+    return store
+
+# Parse a history feed (a str or an iterable of byte chunks) into {symbol: (timestamps, prices)}.
+# With more than one worker, payloads of at least min_bytes are split at block boundaries and
+# parsed in the process pool; the workers' arrays are concatenated back in payload order.
+def parse_columns(data, feed, symbols=None, workers=PARSE_WORKERS, min_bytes=PARALLEL_PARSE_MIN_BYTES):
+    if workers > 1:
+        data = _join_chunks(data)
+    if feed != 'hist1h' and not (workers > 1 and len(data) >= min_bytes):
+        # Streamed into growable columns (the row iterator records the parse metrics)
+        store = _fill_store(iter_timestamped_rows(data, feed, symbols))
+        return {symbol: store.series(symbol) for symbol in store.symbols}
+    if workers > 1 and len(data) >= min_bytes:
+        parts = {}
+        errors = filtered = 0
+        pieces = split_blocks(data, BLOCK_MARKERS[feed], workers * 2)
+        for columns, part_errors, part_filtered in get_parse_pool(workers).map(_parse_part, repeat(feed), pieces, repeat(symbols)):
+            errors += part_errors
+            filtered += part_filtered
+            for symbol, column in columns.items():
+                parts.setdefault(symbol, []).append(column)
+        columns = _concat_columns(parts)
+    else:
+        columns, errors, filtered = _COLUMN_PARSERS[feed](data, symbols)
+    metrics.inc('forex_parsed_rows_total', sum(len(ts) for ts, _ in columns.values()), feed=feed)
+    metrics.inc('forex_parse_errors_total', errors, feed=feed)
+    metrics.inc('forex_filtered_rows_total', filtered, feed=feed)
+    return columns
+
+def _store_from_columns(columns):
+    store = TickStore()
+    for symbol, (timestamps, prices) in columns.items():
+        store.extend(symbol, timestamps, prices)
+    return store.finalize()
+
+# Parse Historical (hist1s) data from SSH connection (a str or an iterable of byte chunks)
+def parse_hist1s_data(data, symbols=None, workers=PARSE_WORKERS):
+    if workers > 1:
+        return _store_from_columns(parse_columns(data, 'hist1s', symbols, workers))
+    return _fill_store(iter_timestamped_rows(data, 'hist1s', symbols)).finalize()
+
+# Parse Historical (hist1m) data from SSH connection (a str or an iterable of byte chunks)
+def parse_hist1m_data(data, symbols=None, workers=PARSE_WORKERS):
+    if workers > 1:
+        return _store_from_columns(parse_columns(data, 'hist1m', symbols, workers))
+    return _fill_store(iter_timestamped_rows(data, 'hist1m', symbols)).finalize()
+
+# Parse Historical (hist1h) data from SSH connection (a str or an iterable of byte chunks)
+def parse_hist1h_data(data, symbols=None, workers=PARSE_WORKERS):
+    return _store_from_columns(parse_columns(data, 'hist1h', symbols, workers))
 
-__all__ = ['parse_hist1h_data', 'parse_hist1m_data', 'parse_hist1s_data', 'parse_real_time_data']
+__all__ = [
+    'BLOCK_MARKERS', 'LineBuffer', 'PARALLEL_PARSE_MIN_BYTES', 'PARSE_WORKERS', 'TREND_LENGTH',
+    'get_parse_pool', 'iter_lines', 'last_header_time', 'parse_header_time', 'iter_symbol_block_rows', 'iter_timestamped_rows', 'parse_columns',
+    'parse_hist1h_data', 'parse_hist1m_data', 'parse_hist1s_data', 'parse_real_time_data', 'split_blocks',
+]
@@ -0,0 +1,235 @@
+import argparse
+import logging
+import socket
+import threading
+from datetime import datetime, timedelta
+from time import monotonic, sleep
+
+import numpy as np
+import paramiko
+
+from utils.connectionUtils import PASSWORD, SSHConnectionPool
+from utils.syntheticFeed import (
+    format_real_time_batch, generate_symbol_block_feed, generate_timestamped_feed, make_symbols, random_walk,
+)
+
+HISTORICAL_FEEDS = ('hist1s', 'hist1m', 'hist1h')
+FEEDS = ('rt',) + HISTORICAL_FEEDS
+
+# Olsen-format history for every historical feed, ending at current_date
+def build_history(symbols, current_date, second_hours=48, minute_days=62, seed=0):
+    current_date = current_date.replace(second=0, microsecond=0)
+    year_start = datetime(current_date.year - 1, 1, 1)
+    return {
+        'hist1s': lambda: generate_timestamped_feed(
+            symbols, current_date - timedelta(hours=second_hours), second_hours * 3600, 1, seed),
+        'hist1m': lambda: generate_timestamped_feed(
+            symbols, current_date - timedelta(days=minute_days), minute_days * 1440, 60, seed + 1),
+        'hist1h': lambda: generate_symbol_block_feed(
+            symbols, year_start, int((current_date - year_start).total_seconds() // 3600), seed + 2),
+    }
+
+# Password auth for the feed logins; records which channels asked for a shell
+class _FeedServerInterface(paramiko.ServerInterface):
+    def __init__(self, password):
+        self.password = password
+        self.username = None
+        self._shells = {}
+        self._lock = threading.Lock()
+
+    def get_allowed_auths(self, username):
+        return 'password'
+
+    def check_auth_password(self, username, password):
+        if username in FEEDS and password == self.password:
+            self.username = username
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind, chanid):
+        if kind != 'session':
+            return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+        self.shell_event(chanid)
+        return paramiko.OPEN_SUCCEEDED
+
+    def check_channel_pty_request(self, channel, term, width, height, pixelwidth, pixelheight, modes):
+        return True
+
+    def check_channel_shell_request(self, channel):
+        self.shell_event(channel.get_id()).set()
+        return True
+
+    def shell_event(self, chanid):
+        with self._lock:
+            return self._shells.setdefault(chanid, threading.Event())
+
+# Local stand-in for the Olsen host: serves the rt/hist1s/hist1m/hist1h shells over real SSH
+# with synthetic data. `tick_rate` is rt batches per second, sent `burst_size` at a time;
+# `fragment` splits every write into random sizes up to `chunk_size`; `disconnect_after`
+# drops the connection after that many seconds of rt and `history_cutoff` after that
+# fraction of a history payload.
+class FakeOlsenServer:
+    def __init__(self, host='127.0.0.1', port=0, password=PASSWORD, symbols=None, history=None,
+                 tick_rate=10.0, burst_size=1, chunk_size=16384, fragment=False,
+                 disconnect_after=None, history_cutoff=None, volatility=1e-4, seed=0):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.symbols = symbols or make_symbols(3)
+        self.tick_rate = tick_rate
+        self.burst_size = burst_size
+        self.chunk_size = chunk_size
+        self.fragment = fragment
+        self.disconnect_after = disconnect_after
+        self.history_cutoff = history_cutoff
+        self.volatility = volatility
+        self.seed = seed
+        self.connections = 0
+        self._history = history or build_history(self.symbols, datetime.now(), seed=seed)
+        self._payloads = {}
+        self._payload_lock = threading.Lock()
+        self._host_key = paramiko.RSAKey.generate(2048)
+        self._socket = None
+        self._transports = []
+        self._stopped = threading.Event()
+
+    # Environment that points connectionUtils (and so the app) at this server
+    def env(self):
+        return {'OLSEN_HOST': self.host, 'OLSEN_PORT': str(self.port), 'OLSEN_PASSWORD': self.password}
+
+    def connection_pool(self, **kwargs):
+        return SSHConnectionPool(self.host, self.port, self.password, **kwargs)
+
+    def start(self):
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((self.host, self.port))
+        self._socket.listen(16)
+        self.port = self._socket.getsockname()[1]
+        threading.Thread(target=self._accept_loop, name='fake-olsen', daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._socket is not None:
+            self._socket.close()
+        for transport in self._transports:
+            transport.close()
+
+    # History payload for a feed, generated once on first request
+    def history_payload(self, feed):
+        with self._payload_lock:
+            payload = self._payloads.get(feed)
+            if payload is None:
+                source = self._history[feed]
+                payload = self._payloads[feed] = source() if callable(source) else source
+            return payload
+
+    def _accept_loop(self):
+        while not self._stopped.is_set():
+            try:
+                sock, _ = self._socket.accept()
+            except OSError:
+                break
+            self.connections += 1
+            threading.Thread(target=self._serve_connection, args=(sock,), daemon=True).start()
+
+    def _serve_connection(self, sock):
+        transport = paramiko.Transport(sock)
+        transport.add_server_key(self._host_key)
+        interface = _FeedServerInterface(self.password)
+        self._transports.append(transport)
+        try:
+            transport.start_server(server=interface)
+        except (paramiko.SSHException, EOFError) as e:
+            logging.info(f"Fake Olsen handshake failed: {e}")
+            return
+        # The client pool multiplexes repeated opens of a feed over one transport
+        while transport.is_active() and not self._stopped.is_set():
+            channel = transport.accept(timeout=1.0)
+            if channel is not None:
+                threading.Thread(target=self._serve_channel, args=(channel, interface), daemon=True).start()
+
+    def _serve_channel(self, channel, interface):
+        if not interface.shell_event(channel.get_id()).wait(10):
+            channel.close()
+            return
+        rng = np.random.default_rng([self.seed, channel.get_id(), self.connections])
+        try:
+            if interface.username == 'rt':
+                self._serve_real_time(channel, rng)
+            else:
+                self._serve_history(channel, interface.username, rng)
+        except (OSError, EOFError, paramiko.SSHException) as e:
+            logging.info(f"Fake Olsen {interface.username} channel closed: {e}")
+        finally:
+            channel.close()
+
+    def _send(self, channel, payload, rng):
+        offset = 0
+        while offset < len(payload):
+            size = int(rng.integers(1, self.chunk_size + 1)) if self.fragment else self.chunk_size
+            channel.sendall(payload[offset:offset + size])
+            offset += size
+
+    def _serve_history(self, channel, feed, rng):
+        payload = self.history_payload(feed)
+        if self.history_cutoff is not None:
+            self._send(channel, payload[:int(len(payload) * self.history_cutoff)], rng)
+            channel.get_transport().close()
+            return
+        self._send(channel, payload, rng)
+        channel.send_exit_status(0)
+
+    def _serve_real_time(self, channel, rng):
+        prices = random_walk(self.symbols, 1, self.seed, self.volatility)[0]
+        started = next_send = monotonic()
+        while not self._stopped.is_set():
+            if self.disconnect_after is not None and monotonic() - started >= self.disconnect_after:
+                channel.get_transport().close()
+                return
+            batches = []
+            for _ in range(self.burst_size):
+                prices = prices * np.exp(rng.normal(0.0, self.volatility, len(self.symbols)))
+                batches.append(format_real_time_batch(self.symbols, datetime.now(), prices))
+            self._send(channel, b''.join(batches), rng)
+            next_send += self.burst_size / self.tick_rate
+            sleep(max(0.0, next_send - monotonic()))
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic Olsen feeds over a local SSH server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=22103)
+    parser.add_argument('--password', default=PASSWORD)
+    parser.add_argument('--symbols', type=int, default=3, help="number of symbols in the synthetic universe")
+    parser.add_argument('--second-hours', type=int, default=48, help="hours of 1s history")
+    parser.add_argument('--minute-days', type=int, default=62, help="days of 1m history")
+    parser.add_argument('--tick-rate', type=float, default=10.0, help="rt batches per second")
+    parser.add_argument('--burst-size', type=int, default=1, help="rt batches sent back to back")
+    parser.add_argument('--chunk-size', type=int, default=16384, help="bytes per write")
+    parser.add_argument('--fragment', action='store_true', help="split writes into random sizes up to --chunk-size")
+    parser.add_argument('--disconnect-after', type=float, help="drop rt connections after this many seconds")
+    parser.add_argument('--history-cutoff', type=float, help="drop history transfers after this fraction of the payload")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    symbols = make_symbols(args.symbols)
+    server = FakeOlsenServer(
+        args.host, args.port, args.password, symbols,
+        build_history(symbols, datetime.now(), args.second_hours, args.minute_days, args.seed),
+        args.tick_rate, args.burst_size, args.chunk_size, args.fragment,
+        args.disconnect_after, args.history_cutoff, seed=args.seed,
+    ).start()
+    print("Fake Olsen server listening; point the app at it with:")
+    print(' '.join(f"{name}={value}" for name, value in server.env().items()) + " streamlit run beta-merge6.py")
+    try:
+        while True:
+            sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+__all__ = ['FEEDS', 'FakeOlsenServer', 'HISTORICAL_FEEDS', 'build_history']
+
+if __name__ == "__main__":
+    main()
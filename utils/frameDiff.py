@@ -0,0 +1,20 @@
+from utils.metrics import metrics
+
+# Remembers what each placeholder last showed, so a repaint only re-sends the ones that changed
+class FrameDiff:
+    def __init__(self):
+        self._last = {}
+
+    # True (and remembered) if `content` differs from what `key` last showed
+    def changed(self, key, content, kind='element'):
+        if key in self._last and self._last[key] == content:
+            metrics.inc('forex_rt_redraws_skipped_total', kind=kind)
+            return False
+        self._last[key] = content
+        metrics.inc('forex_rt_redraws_total', kind=kind)
+        return True
+
+    def forget(self, key):
+        self._last.pop(key, None)
+
+__all__ = ['FrameDiff']
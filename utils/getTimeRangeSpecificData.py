@@ -1,54 +1,17 @@
 from datetime import datetime, timedelta
-from constants.timeRange import TimeRange
-
-def get_time_specific_data(time_range, parsed1s_data, parsed1m_data, parsed1h_data):
-    current_date = datetime.now()
-
-    def merge_hourly_and_minute_data(hourly_data, minute_data, start_date, end_date):
-        # Convert minute data to hourly format for consistency
-        converted_minute_data = []
-        for data in minute_data:
-            try:
-                # Parse time using the minute data format
-                time = datetime.strptime(data['Time'].strip(), '%Y%m%d %H:%M:%S')
-                # Only include data within our target range
-                if start_date <= time <= end_date:
-                    # Round to the nearest hour for consistency with hourly data
-                    rounded_time = time.replace(minute=0, second=0)
-                    converted_minute_data.append({
-                        'Time': rounded_time.strftime('%d.%m.%Y %H:%M:%S'),
-                        'Symbol': data['Symbol'],
-                        'Last Price': data['Last Price']
-                    })
-            except (ValueError, KeyError):
-                continue
-
-
-        # Group minute data by hour and calculate average price
-        minute_hourly_data = {}
-        for data in converted_minute_data:
-            key = (data['Time'], data['Symbol'])
-            if key not in minute_hourly_data:
-                minute_hourly_data[key] = []
-            minute_hourly_data[key].append(data['Last Price'])
-
-        minute_hourly_averaged = [
-            {'Time': time, 'Symbol': symbol, 'Last Price': sum(prices) / len(prices)}
-            for (time, symbol), prices in minute_hourly_data.items()
-        ]
-
-
-        # Create a set of existing timestamps in hourly data
-        hourly_timestamps = {(data['Time'], data['Symbol']) for data in hourly_data}
-
-        # Only add minute data where hourly data is missing
-        merged_data = list(hourly_data)
-        for data in minute_hourly_averaged:
-            if (data['Time'], data['Symbol']) not in hourly_timestamps:
-                merged_data.append(data)
-
-        return sorted(merged_data, key=lambda x: datetime.strptime(x['Time'], '%d.%m.%Y %H:%M:%S'))
-    
+
+import numpy as np
+
+from constants.timeRange import TIME_RANGE_FEEDS, TimeRange
+from utils.metrics import metrics
+from utils.resample import HOUR, fill_missing, resample
+from utils.tickStore import to_epoch
+
+EMPTY_RESULT = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+
+# (start_date, end_date) of a time range as of current_date, or None if it hasn't started yet
+def get_time_range_window(time_range, current_date):
+
     def is_time_period_started(start_date):
         """Check if the time period has started yet"""
         return current_date >= start_date
@@ -58,86 +21,31 @@ def get_time_specific_data(time_range, parsed1s_data, parsed1m_data, parsed1h_da
         case TimeRange.LAST_YEAR_HOURLY.value:
             start_date = datetime(current_date.year - 1, 1, 1)  # 1st Jan of last year
             end_date = datetime(current_date.year - 1, 12, 31, 23, 59, 59)  # 31st Dec of last year
-            
-            # Filter hourly data
-            filtered_hourly = [
-                data for data in parsed1h_data 
-                if start_date <= datetime.strptime(data['Time'], '%d.%m.%Y %H:%M:%S') <= end_date
-            ]
-            
-            # Merge with minute data for missing periods
-            return merge_hourly_and_minute_data(filtered_hourly, parsed1m_data, start_date, end_date)
-        
+
         case TimeRange.CURRENT_YEAR_HOURLY.value:
             start_date = datetime(current_date.year, 1, 1)  # 1st Jan of current year
             end_date = current_date.replace(hour=23, minute=59, second=59)  # Current time
-            
-            # Filter hourly data
-            filtered_hourly = [
-                data for data in parsed1h_data 
-                if start_date <= datetime.strptime(data['Time'], '%d.%m.%Y %H:%M:%S') <= end_date
-            ]
-            
-            # Merge with minute data for missing periods
-            return merge_hourly_and_minute_data(filtered_hourly, parsed1m_data, start_date, end_date)
 
         case TimeRange.CURRENT_YEAR_Q1_HOURLY.value:
             start_date = datetime(current_date.year, 1, 1)  # Q1 start
             end_date = datetime(current_date.year, 3, 31, 23, 59, 59)  # Q1 end
-            if not is_time_period_started(start_date):
-                return []
-            filtered_hourly = [
-                data for data in parsed1h_data 
-                if start_date <= datetime.strptime(data['Time'], '%d.%m.%Y %H:%M:%S') <= end_date
-            ]
-            return merge_hourly_and_minute_data(filtered_hourly, parsed1m_data, start_date, end_date)
 
         case TimeRange.CURRENT_YEAR_Q2_HOURLY.value:
             start_date = datetime(current_date.year, 4, 1)  # Q2 start
             end_date = datetime(current_date.year, 6, 30, 23, 59, 59)  # Q2 end
-            
-            if not is_time_period_started(start_date):
-                return []  # Return empty list if Q2 hasn't started yet
-                
-            filtered_hourly = [
-                data for data in parsed1h_data 
-                if start_date <= datetime.strptime(data['Time'], '%d.%m.%Y %H:%M:%S') <= end_date
-            ]
-            return merge_hourly_and_minute_data(filtered_hourly, parsed1m_data, start_date, end_date)
-
 
         case TimeRange.CURRENT_YEAR_Q3_HOURLY.value:
             start_date = datetime(current_date.year, 7, 1)  # Q3 start
             end_date = datetime(current_date.year, 9, 30, 23, 59, 59)  # Q3 end
-            
-            if not is_time_period_started(start_date):
-                return []  # Return empty list if Q3 hasn't started yet
-                
-            filtered_hourly = [
-                data for data in parsed1h_data 
-                if start_date <= datetime.strptime(data['Time'], '%d.%m.%Y %H:%M:%S') <= end_date
-            ]
-            return merge_hourly_and_minute_data(filtered_hourly, parsed1m_data, start_date, end_date)
 
         case TimeRange.CURRENT_YEAR_Q4_HOURLY.value:
             start_date = datetime(current_date.year, 10, 1)  # Q4 start
             end_date = current_date  # Current time
-            
-            if not is_time_period_started(start_date):
-                return []  # Return empty list if Q4 hasn't started yet
-                
-            filtered_hourly = [
-                data for data in parsed1h_data 
-                if start_date <= datetime.strptime(data['Time'], '%d.%m.%Y %H:%M:%S') <= end_date
-            ]
-            return merge_hourly_and_minute_data(filtered_hourly, parsed1m_data, start_date, end_date)
 
         case TimeRange.LAST_6_MONTHS_HOURLY.value:
             start_date = current_date - timedelta(days=6*30)  # Approximation of 6 months
             end_date = current_date
-            filtered_data = [data for data in parsed1h_data if start_date <= datetime.strptime(data['Time'], '%d.%m.%Y %H:%M:%S') <= end_date]
-            return filtered_data
-  
+
         # Minute aggregations
 
         case TimeRange.LAST_MONTH_MINUTE.value:
@@ -145,45 +53,64 @@ def get_time_specific_data(time_range, parsed1s_data, parsed1m_data, parsed1h_da
             last_day_previous_month = first_day_current_month - timedelta(days=1)
             start_date = last_day_previous_month.replace(day=1)
             end_date = last_day_previous_month
-            filtered_data = [
-                data for data in parsed1m_data 
-                if data.get('Time') and 
-                start_date <= datetime.strptime(data['Time'].strip(), '%Y%m%d %H:%M:%S') <= end_date
-            ]
-            return filtered_data
-            
+
         case TimeRange.LAST_WEEK_MINUTE.value:
             start_date = current_date - timedelta(days=7)  # 7 days ago
             end_date = current_date
-            filtered_data = [data for data in parsed1m_data if start_date <= datetime.strptime(data['Time'], '%Y%m%d %H:%M:%S') <= end_date]
-            return filtered_data
 
         # Second aggregations
         case TimeRange.YESTERDAY_SECOND.value:
             start_date = (current_date - timedelta(days=1)).replace(hour=0, minute=0, second=0)  # Yesterday 12 AM
             end_date = start_date.replace(hour=23, minute=59, second=59)  # Yesterday 11:59 PM
-            filtered_data = [data for data in parsed1s_data if start_date <= datetime.strptime(data['Time'], '%Y%m%d %H:%M:%S') <= end_date]
-            return filtered_data
- 
+
         case TimeRange.TODAY_SECOND.value:
             start_date = current_date.replace(hour=0, minute=0, second=0)  # Today 12 AM
             end_date = current_date  # Current time today
-            filtered_data = [data for data in parsed1s_data if start_date <= datetime.strptime(data['Time'], '%Y%m%d %H:%M:%S') <= end_date]
-            return filtered_data
 
         case TimeRange.LAST_12HR_SECOND.value:
             start_date = current_date - timedelta(hours=12)  # 12 hours ago
             end_date = current_date  # Current time
-            filtered_data = [data for data in parsed1s_data if start_date <= datetime.strptime(data['Time'], '%Y%m%d %H:%M:%S') <= end_date]
-            return filtered_data
 
         case TimeRange.LAST_24HR_SECOND.value:
             start_date = current_date - timedelta(hours=24)  # 24 hours ago
             end_date = current_date  # Current time
-            filtered_data = [data for data in parsed1s_data if start_date <= datetime.strptime(data['Time'], '%Y%m%d %H:%M:%S') <= end_date]
-            return filtered_data
 
         case _:
-            return []  # No data for the time range
+            return None  # No data for the time range
+
+    if not is_time_period_started(start_date):
+        return None  # Return nothing if the period hasn't started yet
+    return start_date, end_date
+
+def get_time_specific_data(time_range, symbol, store1s, store1m, store1h, current_date=None):
+    with metrics.timed('forex_time_range_seconds', time_range=time_range):
+        return _select_time_specific_data(time_range, symbol, store1s, store1m, store1h, current_date)
+
+def _select_time_specific_data(time_range, symbol, store1s, store1m, store1h, current_date):
+    window = get_time_range_window(time_range, current_date or datetime.now())
+    if window is None:
+        return EMPTY_RESULT
+    start, end = to_epoch(window[0]), to_epoch(window[1])
+
+    match TIME_RANGE_FEEDS[TimeRange(time_range)]:
+
+        case ('hist1h', 'hist1m'):
+            # Average minute data into hourly bars and use them only where hourly data is missing
+            hourly_ts, hourly_prices = store1h.window(symbol, start, end)
+            minute_ts, minute_prices = store1m.window(symbol, start, end)
+            minute_hourly_ts, minute_hourly_prices = resample(minute_ts, minute_prices, HOUR, how='mean')
+            return fill_missing(hourly_ts, hourly_prices, minute_hourly_ts, minute_hourly_prices)
+
+        case ('hist1h',):
+            return store1h.window(symbol, start, end)
+
+        case ('hist1m',):
+            return store1m.window(symbol, start, end)
+
+        case ('hist1s',):
+            return store1s.window(symbol, start, end)
+
+        case _:
+            return EMPTY_RESULT
 
-__all__ = ['get_time_specific_data']
+__all__ = ['EMPTY_RESULT', 'get_time_range_window', 'get_time_specific_data']
@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+
+# Download/parse counters for one feed, written by its loader thread and read by the UI
+class FeedProgress:
+    def __init__(self, feed):
+        self.feed = feed
+        self.bytes = 0
+        self.rows = 0
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time()) - self.started_at
+
+def track_bytes(chunks, progress):
+    for chunk in chunks:
+        progress.bytes += len(chunk)
+        yield chunk
+
+def track_rows(rows, progress):
+    for row in rows:
+        progress.rows += 1
+        yield row
+
+# Loads every feed on its own future so each resolution becomes available independently
+class HistoryLoader:
+    def __init__(self, loaders):
+        self._loaders = loaders
+        self._progress = {feed: FeedProgress(feed) for feed in loaders}
+        self._futures = {}
+        self._executor = ThreadPoolExecutor(max_workers=len(loaders), thread_name_prefix='history')
+
+    def start(self):
+        for feed, load in self._loaders.items():
+            if feed not in self._futures:
+                self._futures[feed] = self._executor.submit(self._run, feed, load)
+        return self
+
+    def _run(self, feed, load):
+        progress = self._progress[feed]
+        progress.started_at = time()
+        try:
+            return load(progress)
+        finally:
+            progress.finished_at = time()
+
+    def progress(self, feed):
+        return self._progress[feed]
+
+    def ready(self, feed):
+        future = self._futures.get(feed)
+        return future is not None and future.done() and future.exception() is None
+
+    def error(self, feed):
+        future = self._futures.get(feed)
+        if future is None or not future.done():
+            return None
+        return future.exception()
+
+    # The loaded resource for a feed, or None while it is still loading (or failed)
+    def result(self, feed):
+        return self._futures[feed].result() if self.ready(feed) else None
+
+__all__ = ['FeedProgress', 'HistoryLoader', 'track_bytes', 'track_rows']
@@ -0,0 +1,88 @@
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from constants.timeRange import TIME_RANGE_FEEDS, TimeRange
+from utils.getTimeRangeSpecificData import get_time_range_window
+from utils.tickStore import TickStore, to_epoch
+
+# Bar width in seconds of each historical feed
+FEED_INTERVALS = {'hist1s': 1, 'hist1m': 60, 'hist1h': 3600}
+
+# Oldest timestamp any TimeRange still reads from a feed; older rows can be evicted
+def get_feed_floor(feed, current_date):
+    starts = [
+        to_epoch(window[0])
+        for time_range in TimeRange
+        if feed in TIME_RANGE_FEEDS[time_range]
+        for window in [get_time_range_window(time_range.value, current_date)]
+        if window is not None
+    ]
+    return min(starts) if starts else None
+
+# Real-time ticks folded into per-feed bars (last price per second/minute/hour), kept
+# alongside the downloaded history so today's ranges stay current without a re-download
+class LiveHistory:
+    def __init__(self):
+        self.stores = {feed: TickStore() for feed in FEED_INTERVALS}
+        self.floors = {feed: None for feed in FEED_INTERVALS}
+        self.version = 0
+        self._lock = threading.Lock()
+
+    # Hub listener: fold a batch of rt rows at the feed wall-clock time of their batch header,
+    # falling back to the local clock for rows that arrived before any header
+    def on_rows(self, rows, current_date=None):
+        now = to_epoch(current_date or datetime.now())
+        with self._lock:
+            for row in rows:
+                ts = row.get('Time')
+                if ts is None:
+                    ts = now
+                for feed, interval in FEED_INTERVALS.items():
+                    self.stores[feed].upsert_last(row['Symbol'], ts // interval * interval, row['Price'])
+            self.version += 1
+
+    # Drop live rows that have left every window and record the floors for the base history
+    def evict(self, current_date=None):
+        current_date = current_date or datetime.now()
+        with self._lock:
+            for feed, store in self.stores.items():
+                floor = get_feed_floor(feed, current_date)
+                self.floors[feed] = floor
+                if floor is not None:
+                    store.drop_before(floor)
+
+    def layered(self, feed, base):
+        return LayeredStore(base, self.stores[feed], self.floors[feed], self._lock)
+
+# Read-only view of a downloaded store with the live rows after its last timestamp appended.
+# `lock` guards the live store, which the hub thread and evictions write to in place.
+class LayeredStore:
+    def __init__(self, base, live, floor=None, lock=None):
+        self.base = base
+        self.live = live
+        self.floor = floor
+        self.lock = lock or threading.Lock()
+
+    @property
+    def symbols(self):
+        return self.base.symbols + [symbol for symbol in self.live.symbols if symbol not in self.base]
+
+    def __contains__(self, symbol):
+        return symbol in self.base or symbol in self.live
+
+    def window(self, symbol, start, end):
+        if self.floor is not None:
+            start = max(start, self.floor)
+        base_ts, base_prices = self.base.window(symbol, start, end)
+        base_last = self.base.last_timestamp(symbol)
+        live_start = start if base_last is None else max(start, base_last + 1)
+        # Concatenating copies the live slice before the lock is released
+        with self.lock:
+            live_ts, live_prices = self.live.window(symbol, live_start, end)
+            if not len(live_ts):
+                return base_ts, base_prices
+            return np.concatenate((base_ts, live_ts)), np.concatenate((base_prices, live_prices))
+
+__all__ = ['FEED_INTERVALS', 'LayeredStore', 'LiveHistory', 'get_feed_floor']
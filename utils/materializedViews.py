@@ -0,0 +1,118 @@
+import logging
+import threading
+from datetime import datetime
+from time import perf_counter
+
+from constants.timeRange import TIME_RANGE_FEEDS, TimeRange
+from utils.getTimeRangeSpecificData import get_time_specific_data
+
+# Ranges whose window moves with the clock and are rebuilt on every refresh tick
+ROLLING_RANGES = (
+    TimeRange.TODAY_SECOND,
+    TimeRange.LAST_12HR_SECOND,
+    TimeRange.LAST_24HR_SECOND,
+    TimeRange.LAST_WEEK_MINUTE,
+    TimeRange.LAST_6_MONTHS_HOURLY,
+    TimeRange.CURRENT_YEAR_Q4_HOURLY,
+    TimeRange.CURRENT_YEAR_HOURLY,
+)
+
+# Build timings and sizes of one materialized range
+class ViewStats:
+    def __init__(self, time_range, seconds, symbols, rows, nbytes):
+        self.time_range = time_range
+        self.seconds = seconds
+        self.symbols = symbols
+        self.rows = rows
+        self.nbytes = nbytes
+
+# Precomputed (timestamps, prices) per (TimeRange, symbol), rebuilt in a background thread.
+# `get_stores` returns {feed: TickStore or None} and `data_version` changes whenever a store does;
+# `symbols` limits the views to those symbols (e.g. the preloaded ones) instead of every stored one.
+class TimeRangeViews:
+    def __init__(self, get_stores, data_version, refresh_interval=60.0, symbols=None):
+        self._get_stores = get_stores
+        self._data_version = data_version
+        self.refresh_interval = refresh_interval
+        self.symbols = symbols
+        self._views = {}
+        self._versions = {}
+        self._built_from = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='range-views', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logging.warning(f"Materialized view refresh failed: {e}")
+            self._stopped.wait(self.refresh_interval)
+
+    # Rebuild ranges whose source data changed since their last build, plus the rolling ones
+    def refresh(self, current_date=None):
+        current_date = current_date or datetime.now()
+        stores = self._get_stores()
+        version = self._data_version()
+        day = current_date.date()
+        for time_range in TimeRange:
+            feeds = TIME_RANGE_FEEDS[time_range]
+            if any(stores.get(feed) is None for feed in feeds):
+                continue
+            source = (version, day)
+            if self._built_from.get(time_range) == source and time_range not in ROLLING_RANGES:
+                continue
+            self.build(time_range, stores, current_date)
+            self._built_from[time_range] = source
+
+    def build(self, time_range, stores, current_date=None):
+        started = perf_counter()
+        feeds = TIME_RANGE_FEEDS[time_range]
+        symbols = set().union(*(stores[feed].symbols for feed in feeds))
+        if self.symbols is not None:
+            symbols &= set(self.symbols)
+        symbols = sorted(symbols)
+        views = {
+            symbol: get_time_specific_data(
+                time_range.value, symbol,
+                stores.get('hist1s'), stores.get('hist1m'), stores.get('hist1h'),
+                current_date,
+            )
+            for symbol in symbols
+        }
+        stats = ViewStats(
+            time_range,
+            perf_counter() - started,
+            len(views),
+            sum(len(ts) for ts, _ in views.values()),
+            sum(ts.nbytes + prices.nbytes for ts, prices in views.values()),
+        )
+        with self._lock:
+            for symbol, view in views.items():
+                self._views[(time_range, symbol)] = view
+            self._versions[time_range] = self._versions.get(time_range, 0) + 1
+            self._stats[time_range] = stats
+
+    # Precomputed series for a range and symbol, or None if it hasn't been built yet
+    def get(self, time_range, symbol):
+        return self._views.get((time_range, symbol))
+
+    def version(self, time_range):
+        return self._versions.get(time_range, 0)
+
+    def stats(self):
+        with self._lock:
+            return list(self._stats.values())
+
+__all__ = ['ROLLING_RANGES', 'TimeRangeViews', 'ViewStats']
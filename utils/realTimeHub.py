@@ -0,0 +1,161 @@
+import logging
+import select
+import threading
+from collections import deque
+from time import sleep, time
+
+from utils.connectionUtils import connect_ssh_agent
+from utils.dataParser import TREND_LENGTH, LineBuffer, last_header_time, parse_real_time_data
+from utils.metrics import metrics
+from utils.rollingStats import StatisticsEngine
+
+# Block until the channel has data (or timeout); channels without a fileno fall back to polling
+def wait_readable(channel, timeout):
+    if channel.recv_ready():
+        return True
+    if hasattr(channel, 'fileno'):
+        readable, _, _ = select.select([channel], [], [], timeout)
+        return bool(readable)
+    sleep(min(timeout, 0.01))
+    return channel.recv_ready()
+
+# Drain everything buffered on a readable channel and return the complete lines
+def read_available_lines(channel, line_buffer, chunk_size=65536):
+    data = channel.recv(chunk_size)
+    if not data:
+        raise EOFError("rt channel closed")
+    received = len(data)
+    lines = line_buffer.feed(data)
+    while channel.recv_ready():
+        data = channel.recv(chunk_size)
+        received += len(data)
+        lines.extend(line_buffer.feed(data))
+    metrics.inc('forex_ssh_bytes_total', received, feed='rt')
+    return lines
+
+# Process-wide owner of the single rt channel; parses ticks once and fans them out to sessions
+class RealTimeHub:
+    def __init__(self, connect=lambda: connect_ssh_agent("rt"), trend_length=TREND_LENGTH, wait_timeout=1.0, reconnect_delay=5.0, log_size=256, symbols=None):
+        self._connect = connect
+        self._trend_length = trend_length
+        self._symbols = symbols
+        self.statistics = StatisticsEngine()
+        self._listeners = []
+        self._wait_timeout = wait_timeout
+        self._reconnect_delay = reconnect_delay
+        self._historic_data = {}
+        self._rows = {}
+        self._log = deque(maxlen=log_size)
+        self._version = 0
+        self.received_at = None
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def version(self):
+        return self._version
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='rt-hub', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+
+    # Called from the reader thread with every parsed batch of rows
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def subscribe(self):
+        return Subscription(self)
+
+    # Latest row per symbol and the version it corresponds to
+    def snapshot(self):
+        with self._condition:
+            return dict(self._rows), self._version
+
+    def publish(self, rows):
+        if not rows:
+            return
+        now = self.received_at = time()
+        for row in rows:
+            self.statistics.update(row['Symbol'], now, row['Price'])
+        for listener in self._listeners:
+            try:
+                listener(rows)
+            except Exception as e:
+                logging.warning(f"Real-time listener failed: {e}")
+        with self._condition:
+            for row in rows:
+                self._rows[row['Symbol']] = row
+            self._version += 1
+            self._log.append((self._version, rows))
+            self._condition.notify_all()
+
+    # Rows published after version `since` plus the current version; None rows when the log no longer reaches back that far
+    def changes_since(self, since):
+        with self._condition:
+            if since >= self._version:
+                return {}, self._version
+            if not self._log or self._log[0][0] > since + 1:
+                return None, self._version
+            changed = {}
+            for version, rows in self._log:
+                if version > since:
+                    for row in rows:
+                        changed[row['Symbol']] = row
+            return changed, self._version
+
+    def wait_for_version(self, since, timeout):
+        with self._condition:
+            self._condition.wait_for(lambda: self._version > since or self._stopped.is_set(), timeout)
+            return self._version
+
+    def _run(self):
+        while not self._stopped.is_set():
+            channel = None
+            try:
+                channel = self._connect()
+                line_buffer = LineBuffer()
+                feed_time = None
+                while not self._stopped.is_set() and not channel.exit_status_ready():
+                    if not wait_readable(channel, self._wait_timeout):
+                        self.statistics.refresh(time())
+                        continue
+                    lines = read_available_lines(channel, line_buffer)
+                    if lines:
+                        # A batch can span reads, so its header time carries over to the next read
+                        rows = parse_real_time_data('\n'.join(lines), self._historic_data, self._trend_length, self._symbols, feed_time)
+                        feed_time = last_header_time(lines, feed_time)
+                        self.publish(rows)
+            except Exception as e:
+                logging.warning(f"Real-time feed dropped: {e}")
+            finally:
+                if channel is not None:
+                    channel.close()
+            self._stopped.wait(self._reconnect_delay)
+
+# One session's cursor into the hub: a snapshot first, then only the rows that changed
+class Subscription:
+    def __init__(self, hub):
+        self._hub = hub
+        self._version = -1
+
+    def snapshot(self):
+        rows, self._version = self._hub.snapshot()
+        return rows
+
+    def poll(self, timeout=1.0):
+        if self._version < 0:
+            return self.snapshot()
+        self._hub.wait_for_version(self._version, timeout)
+        changed, version = self._hub.changes_since(self._version)
+        if changed is None:
+            return self.snapshot()
+        self._version = version
+        return changed
+
+__all__ = ['RealTimeHub', 'Subscription', 'read_available_lines', 'wait_readable']
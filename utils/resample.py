@@ -0,0 +1,51 @@
+from collections import namedtuple
+
+import numpy as np
+
+HOUR = 3600
+
+OHLC = namedtuple('OHLC', ['timestamps', 'open', 'high', 'low', 'close', 'count'])
+
+def _bucket_starts(timestamps, interval):
+    buckets = timestamps // interval * interval
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    return buckets[starts], starts
+
+# Resample sorted (timestamps, prices) into fixed-width bars in one grouped pass
+def resample(timestamps, prices, interval, how='mean'):
+    if how not in ('mean', 'ohlc'):
+        raise ValueError(f"Unsupported aggregation: {how}")
+    if not len(timestamps):
+        empty_ts = np.empty(0, dtype=np.int64)
+        empty_px = np.empty(0, dtype=np.float64)
+        if how == 'ohlc':
+            return OHLC(empty_ts, empty_px, empty_px, empty_px, empty_px, np.empty(0, dtype=np.int64))
+        return empty_ts, empty_px
+
+    bar_ts, starts = _bucket_starts(timestamps, interval)
+    ends = np.append(starts[1:], len(prices))
+    counts = ends - starts
+
+    if how == 'mean':
+        return bar_ts, np.add.reduceat(prices, starts) / counts
+
+    return OHLC(
+        bar_ts,
+        prices[starts],
+        np.maximum.reduceat(prices, starts),
+        np.minimum.reduceat(prices, starts),
+        prices[ends - 1],
+        counts,
+    )
+
+# Merge two sorted series, taking fill rows only where base has no row at that timestamp
+def fill_missing(base_ts, base_prices, fill_ts, fill_prices):
+    missing = ~np.isin(fill_ts, base_ts, assume_unique=True)
+    if not missing.any():
+        return base_ts, base_prices
+    merged_ts = np.concatenate((base_ts, fill_ts[missing]))
+    merged_prices = np.concatenate((base_prices, fill_prices[missing]))
+    order = np.argsort(merged_ts, kind='stable')
+    return merged_ts[order], merged_prices[order]
+
+__all__ = ['HOUR', 'OHLC', 'fill_missing', 'resample']
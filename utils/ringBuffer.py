@@ -0,0 +1,38 @@
+import numpy as np
+
+# Fixed-size float64 ring buffer. Every value is written twice (at i and i + capacity), so
+# the last `capacity` values are always one contiguous slice and view() never copies.
+class RingBuffer:
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=np.float64)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, value):
+        end = (self._start + self._size) % self.capacity
+        self._data[end] = value
+        self._data[end + self.capacity] = value
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    @property
+    def last(self):
+        if not self._size:
+            raise IndexError("last from empty RingBuffer")
+        return self._data[self._start + self._size - 1]
+
+    # Read-only zero-copy view of the values, oldest first
+    def view(self):
+        view = self._data[self._start:self._start + self._size]
+        view.flags.writeable = False
+        return view
+
+__all__ = ['RingBuffer']
@@ -0,0 +1,102 @@
+import math
+import threading
+from collections import deque
+
+# Windows tracked for every symbol, in seconds
+WINDOWS = {'1m': 60, '5m': 300, '1h': 3600}
+
+# Time-based rolling window with O(1) amortized updates: monotonic deques for high/low
+# and running sums (shifted by the first price, for precision) for mean/stdev
+class RollingWindow:
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self._ticks = deque()
+        self._highs = deque()
+        self._lows = deque()
+        self._seq = 0
+        self._shift = None
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def __len__(self):
+        return len(self._ticks)
+
+    def update(self, ts, price):
+        if self._shift is None:
+            self._shift = price
+        self._seq += 1
+        self._ticks.append((self._seq, ts, price))
+        while self._highs and self._highs[-1][1] <= price:
+            self._highs.pop()
+        self._highs.append((self._seq, price))
+        while self._lows and self._lows[-1][1] >= price:
+            self._lows.pop()
+        self._lows.append((self._seq, price))
+        delta = price - self._shift
+        self._sum += delta
+        self._sumsq += delta * delta
+        self.evict(ts)
+
+    def evict(self, now):
+        cutoff = now - self.seconds
+        while self._ticks and self._ticks[0][1] <= cutoff:
+            seq, _, price = self._ticks.popleft()
+            delta = price - self._shift
+            self._sum -= delta
+            self._sumsq -= delta * delta
+            if self._highs[0][0] == seq:
+                self._highs.popleft()
+            if self._lows[0][0] == seq:
+                self._lows.popleft()
+        if not self._ticks:
+            self._sum = self._sumsq = 0.0
+
+    def stats(self):
+        count = len(self._ticks)
+        if not count:
+            return {'count': 0}
+        mean = self._sum / count
+        variance = max(self._sumsq / count - mean * mean, 0.0)
+        first, last = self._ticks[0][2], self._ticks[-1][2]
+        return {
+            'count': count,
+            'high': self._highs[0][1],
+            'low': self._lows[0][1],
+            'mean': self._shift + mean,
+            'stdev': math.sqrt(variance),
+            'return': (last / first - 1) if first else 0.0,
+        }
+
+# Process-wide rolling statistics per symbol; readers get the snapshot computed at the last update
+class StatisticsEngine:
+    def __init__(self, windows=WINDOWS):
+        self.windows = windows
+        self._symbols = {}
+        self._snapshots = {}
+        self._lock = threading.Lock()
+
+    def _windows_for(self, symbol):
+        windows = self._symbols.get(symbol)
+        if windows is None:
+            windows = self._symbols[symbol] = {name: RollingWindow(seconds) for name, seconds in self.windows.items()}
+        return windows
+
+    def update(self, symbol, ts, price):
+        with self._lock:
+            windows = self._windows_for(symbol)
+            for window in windows.values():
+                window.update(ts, price)
+            self._snapshots[symbol] = {name: window.stats() for name, window in windows.items()}
+
+    # Age out ticks for symbols that have gone quiet
+    def refresh(self, now):
+        with self._lock:
+            for symbol, windows in self._symbols.items():
+                for window in windows.values():
+                    window.evict(now)
+                self._snapshots[symbol] = {name: window.stats() for name, window in windows.items()}
+
+    def snapshot(self, symbol):
+        return self._snapshots.get(symbol, {})
+
+__all__ = ['RollingWindow', 'StatisticsEngine', 'WINDOWS']
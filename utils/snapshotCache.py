@@ -0,0 +1,310 @@
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from time import sleep, time, time_ns
+
+import numpy as np
+
+from utils.dataParser import PARSE_WORKERS, iter_timestamped_rows, parse_columns
+from utils.historyLoader import track_rows
+from utils.metrics import metrics
+from utils.tickStore import TickSeries, TickStore
+
+try:
+    import fcntl
+except ImportError:  # Windows: every process acts as the writer
+    fcntl = None
+
+CACHE_DIR = os.environ.get('FOREX_CACHE_DIR', os.path.join('.cache', 'history'))
+MANIFEST = 'manifest.json'
+CURRENT = 'CURRENT'
+KEEP_GENERATIONS = 2
+
+def _write_array(path, array):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, np.ascontiguousarray(array))
+    os.replace(tmp_path, path)
+
+def _write_text(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+# Write one store as per-symbol .npy columns plus a manifest
+def write_store(directory, feed, store):
+    os.makedirs(directory, exist_ok=True)
+    symbols = []
+    for code, symbol in enumerate(store.symbols):
+        timestamps, prices = store.series(symbol)
+        _write_array(os.path.join(directory, f"{code:04d}.ts.npy"), timestamps)
+        _write_array(os.path.join(directory, f"{code:04d}.px.npy"), prices)
+        symbols.append({'symbol': symbol, 'file': f"{code:04d}", 'rows': len(timestamps)})
+
+    manifest = {'feed': feed, 'saved_at': time(), 'symbols': symbols, 'last_ts': store.last_timestamps()}
+    _write_text(os.path.join(directory, MANIFEST), json.dumps(manifest))
+
+# Read a store written by write_store, memory-mapping its columns read-only
+def read_store(directory, mmap=True):
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+    store = TickStore()
+    mmap_mode = 'r' if mmap else None
+    for entry in manifest['symbols']:
+        timestamps = np.load(os.path.join(directory, f"{entry['file']}.ts.npy"), mmap_mode=mmap_mode)
+        prices = np.load(os.path.join(directory, f"{entry['file']}.px.npy"), mmap_mode=mmap_mode)
+        store.adopt(entry['symbol'], timestamps[:entry['rows']], prices[:entry['rows']])
+    return store
+
+# Read-only snapshot store that opens a symbol's columns on its first request. `resident`
+# symbols are opened up front and never dropped; the others are kept in LRU order and the
+# least recently used are dropped once together they map more than max_bytes.
+class LazySnapshotStore:
+    def __init__(self, directory, resident=(), max_bytes=256 * 2**20, mmap=True):
+        with open(os.path.join(directory, MANIFEST)) as f:
+            manifest = json.load(f)
+        self.directory = directory
+        self.feed = manifest['feed']
+        self.max_bytes = max_bytes
+        self._entries = {entry['symbol']: dict(entry, directory=directory) for entry in manifest['symbols']}
+        self.symbols = list(self._entries)
+        self._last_ts = manifest['last_ts']
+        self._resident = set(resident)
+        self._mmap_mode = 'r' if mmap else None
+        self._loaded = OrderedDict()
+        self._loaded_bytes = 0
+        self._lock = threading.Lock()
+        for symbol in self.symbols:
+            if symbol in self._resident:
+                self._loaded[symbol] = self._read(self._entries[symbol])
+
+    def __len__(self):
+        return sum(entry['rows'] for entry in self._entries.values())
+
+    def __contains__(self, symbol):
+        return symbol in self._entries
+
+    def _read(self, entry):
+        timestamps = np.load(os.path.join(entry['directory'], f"{entry['file']}.ts.npy"), mmap_mode=self._mmap_mode)
+        prices = np.load(os.path.join(entry['directory'], f"{entry['file']}.px.npy"), mmap_mode=self._mmap_mode)
+        return TickSeries.from_arrays(timestamps[:entry['rows']], prices[:entry['rows']])
+
+    # This store's generation was pruned before the symbol was first opened: read the symbol
+    # from the generation CURRENT points at now. Columns already mapped stay where they are.
+    def _read_current(self, symbol):
+        feed_dir = os.path.dirname(os.path.abspath(self.directory))
+        with open(os.path.join(feed_dir, CURRENT)) as f:
+            directory = os.path.join(feed_dir, f.read().strip())
+        with open(os.path.join(directory, MANIFEST)) as f:
+            manifest = json.load(f)
+        entry = next((entry for entry in manifest['symbols'] if entry['symbol'] == symbol), None)
+        if entry is None:
+            return TickSeries(capacity=0)
+        self._entries[symbol] = entry = dict(entry, directory=directory)
+        self._last_ts[symbol] = manifest['last_ts'].get(symbol)
+        return self._read(entry)
+
+    def _series(self, symbol):
+        entry = self._entries.get(symbol)
+        if entry is None:
+            return None
+        with self._lock:
+            series = self._loaded.get(symbol)
+            if series is not None:
+                self._loaded.move_to_end(symbol)
+                return series
+            try:
+                series = self._read(entry)
+            except FileNotFoundError:
+                series = self._read_current(symbol)
+            self._loaded[symbol] = series
+            self._loaded_bytes += series.timestamps.nbytes + series.prices.nbytes
+            metrics.inc('forex_lazy_symbol_loads_total', feed=self.feed)
+            self._evict()
+            return series
+
+    def _evict(self):
+        for symbol in list(self._loaded):
+            if self._loaded_bytes <= self.max_bytes:
+                break
+            if symbol in self._resident:
+                continue
+            series = self._loaded.pop(symbol)
+            self._loaded_bytes -= series.timestamps.nbytes + series.prices.nbytes
+            metrics.inc('forex_lazy_symbol_evictions_total', feed=self.feed)
+
+    # Symbols currently held in memory
+    def loaded_symbols(self):
+        with self._lock:
+            return list(self._loaded)
+
+    def window(self, symbol, start, end):
+        series = self._series(symbol)
+        if series is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return series.window(start, end)
+
+    def series(self, symbol):
+        series = self._series(symbol)
+        if series is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return series.timestamps, series.prices
+
+    def last_timestamp(self, symbol):
+        return self._last_ts.get(symbol)
+
+    def last_timestamps(self):
+        return dict(self._last_ts)
+
+    # Every symbol adopted (still memory-mapped) into a TickStore that can be appended to
+    def to_tick_store(self):
+        store = TickStore()
+        for symbol, entry in self._entries.items():
+            series = self._read(entry)
+            store.adopt(symbol, series.timestamps, series.prices)
+        return store
+
+# Name of the generation CURRENT points at for a feed, or None if nothing was published
+def current_generation(feed, root=CACHE_DIR):
+    try:
+        with open(os.path.join(root, feed, CURRENT)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def _prune_generations(feed_dir, keep):
+    generations = sorted(name for name in os.listdir(feed_dir) if name.startswith('gen-'))
+    for name in generations[:-keep]:
+        # Readers that still map an old generation keep their pages on POSIX; lazy stores
+        # open symbols they had not mapped yet from the current generation instead
+        shutil.rmtree(os.path.join(feed_dir, name), ignore_errors=True)
+
+# Publish a store as a new read-only generation and atomically swap CURRENT to it
+def save_snapshot(feed, store, root=CACHE_DIR):
+    feed_dir = os.path.join(root, feed)
+    generation = f"gen-{time_ns():020d}-{os.getpid()}"
+    write_store(os.path.join(feed_dir, generation), feed, store)
+    _write_text(os.path.join(feed_dir, CURRENT), generation)
+    _prune_generations(feed_dir, KEEP_GENERATIONS)
+    return generation
+
+# Load the current generation of a feed as a memory-mapped TickStore, or None if absent.
+# With `resident` given it is opened as a LazySnapshotStore instead.
+def load_snapshot(feed, root=CACHE_DIR, mmap=True, resident=None, max_bytes=256 * 2**20):
+    generation = current_generation(feed, root)
+    if generation is None:
+        return None
+    try:
+        directory = os.path.join(root, feed, generation)
+        if resident is not None:
+            return LazySnapshotStore(directory, resident, max_bytes, mmap=mmap)
+        return read_store(directory, mmap=mmap)
+    except (OSError, ValueError, KeyError) as e:
+        logging.warning(f"Ignoring unreadable snapshot for {feed}: {e}")
+        return None
+
+# Append only the rows newer than each symbol's last stored timestamp
+def append_newer_rows(store, rows):
+    last_ts = store.last_timestamps()
+    appended = 0
+    for symbol, ts, price in rows:
+        if ts > last_ts.get(symbol, -1):
+            store.append(symbol, ts, price)
+            last_ts[symbol] = ts
+            appended += 1
+    store.finalize()
+    return appended
+
+# Columnar form of append_newer_rows for parsed {symbol: (timestamps, prices)}: a row is kept
+# when it is newer than the stored tail and every earlier row of the batch
+def append_newer_columns(store, columns):
+    last_ts = store.last_timestamps()
+    appended = 0
+    for symbol, (timestamps, prices) in columns.items():
+        previous = np.maximum.accumulate(np.concatenate(([last_ts.get(symbol, -1)], timestamps)))[:-1]
+        keep = timestamps > previous
+        count = int(np.count_nonzero(keep))
+        if count:
+            store.extend(symbol, timestamps[keep], prices[keep])
+            appended += count
+    store.finalize()
+    return appended
+
+# Parse a history feed's chunks and append the rows newer than the store's. hist1s/hist1m rows
+# stream in as the chunks arrive; hist1h is decoded a '#SYMBOL' block at a time into columns;
+# with more than one worker the whole payload is parsed in the process pool.
+def ingest_feed(store, chunks, feed, symbols=None, workers=PARSE_WORKERS, progress=None):
+    if workers > 1 or feed == 'hist1h':
+        columns = parse_columns(chunks, feed, symbols, workers)
+        if progress is not None:
+            progress.rows += sum(len(timestamps) for timestamps, _ in columns.values())
+        return append_newer_columns(store, columns)
+    rows = iter_timestamped_rows(chunks, feed, symbols)
+    if progress is not None:
+        rows = track_rows(rows, progress)
+    return append_newer_rows(store, rows)
+
+# Process-local handle on a feed's shared snapshot; re-attaches zero-copy when a new generation lands
+class SharedFeed:
+    def __init__(self, feed, root=CACHE_DIR, check_interval=5.0, resident=None, max_bytes=256 * 2**20):
+        self.feed = feed
+        self.root = root
+        self.check_interval = check_interval
+        self.resident = resident
+        self.max_bytes = max_bytes
+        self.generation = None
+        self._store = None
+        self._checked_at = 0.0
+        self._lock_file = None
+        self._lock = threading.Lock()
+
+    @property
+    def store(self):
+        if time() - self._checked_at >= self.check_interval:
+            self.reload()
+        return self._store
+
+    def reload(self):
+        with self._lock:
+            self._checked_at = time()
+            generation = current_generation(self.feed, self.root)
+            if generation is not None and generation != self.generation:
+                store = load_snapshot(self.feed, self.root, resident=self.resident, max_bytes=self.max_bytes)
+                if store is not None:
+                    self._store, self.generation = store, generation
+        return self._store
+
+    # Become the one process that downloads and publishes this feed
+    def acquire_writer(self):
+        if fcntl is None:
+            return True
+        os.makedirs(os.path.join(self.root, self.feed), exist_ok=True)
+        lock_file = open(os.path.join(self.root, self.feed, '.writer.lock'), 'w')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def publish(self, store):
+        self._store = store
+        save_snapshot(self.feed, store, self.root)
+        return self.reload()
+
+    # Block until another process has published a generation
+    def wait(self, timeout=600, poll=1.0):
+        deadline = time() + timeout
+        while self.reload() is None and time() < deadline:
+            sleep(poll)
+        return self._store
+
+__all__ = [
+    'CACHE_DIR', 'LazySnapshotStore', 'SharedFeed', 'append_newer_columns', 'append_newer_rows', 'current_generation', 'ingest_feed',
+    'load_snapshot', 'read_store', 'save_snapshot', 'write_store',
+]
@@ -0,0 +1,78 @@
+import os
+import threading
+
+from constants.currencyPairs import DEFAULT_CURRENCY_PAIRS
+
+# Memory budget of lazily loaded (non-preloaded) symbols per feed store
+DEFAULT_CACHE_MB = 256
+
+# 'EURUSD' -> 'EUR/USD'; other symbols are shown as they are
+def display_name(symbol):
+    if len(symbol) == 6 and symbol.isalpha():
+        return f"{symbol[:3]}/{symbol[3:]}"
+    return symbol
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+# The symbol universe the app ingests and shows. Rows of other symbols are dropped at parse
+# time; `preload` symbols are kept loaded and pre-built, the rest load on first view.
+class SymbolRegistry:
+    def __init__(self, symbols, preload=None, cache_bytes=DEFAULT_CACHE_MB * 2**20, display_names=None):
+        self.symbols = list(dict.fromkeys(symbols))
+        self.accepted = frozenset(self.symbols)
+        if preload is None:
+            preload = [symbol for symbol in self.symbols if symbol in DEFAULT_CURRENCY_PAIRS.values()] or self.symbols[:3]
+        self.preload = [symbol for symbol in dict.fromkeys(preload) if symbol in self.accepted]
+        self.cache_bytes = cache_bytes
+        self._names = {symbol: name for name, symbol in DEFAULT_CURRENCY_PAIRS.items()}
+        self._names.update(display_names or {})
+
+    def __contains__(self, symbol):
+        return symbol in self.accepted
+
+    def __iter__(self):
+        return iter(self.symbols)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def display_name(self, symbol):
+        return self._names.get(symbol) or display_name(symbol)
+
+    # {display name: symbol} in configured order, for the UI selectors
+    def pairs(self):
+        return {self.display_name(symbol): symbol for symbol in self.symbols}
+
+    # FOREX_SYMBOLS: 'EURUSD,GBPUSD' or 'EURUSD=EUR/USD,...'; FOREX_PRELOAD_SYMBOLS: comma list;
+    # FOREX_SYMBOL_CACHE_MB: memory budget of the lazily loaded symbols
+    @classmethod
+    def from_env(cls, environ=os.environ):
+        entries = _split(environ.get('FOREX_SYMBOLS', ''))
+        if not entries:
+            entries = [f"{symbol}={name}" for name, symbol in DEFAULT_CURRENCY_PAIRS.items()]
+        symbols, names = [], {}
+        for entry in entries:
+            symbol, _, name = entry.partition('=')
+            symbols.append(symbol.strip().upper())
+            if name.strip():
+                names[symbol.strip().upper()] = name.strip()
+        preload = environ.get('FOREX_PRELOAD_SYMBOLS')
+        return cls(
+            symbols,
+            preload=[symbol.upper() for symbol in _split(preload)] if preload is not None else None,
+            cache_bytes=int(float(environ.get('FOREX_SYMBOL_CACHE_MB', DEFAULT_CACHE_MB)) * 2**20),
+            display_names=names,
+        )
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+def get_symbol_registry():
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = SymbolRegistry.from_env()
+        return _default_registry
+
+__all__ = ['DEFAULT_CACHE_MB', 'SymbolRegistry', 'display_name', 'get_symbol_registry']
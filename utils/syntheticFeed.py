@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+import numpy as np
+
+DEFAULT_SYMBOLS = ['EURUSD', 'GBPUSD', 'USDCHF']
+BASE_PRICES = {'EURUSD': 1.08, 'GBPUSD': 1.27, 'USDCHF': 0.88}
+
+# Symbol names for a synthetic universe of `count` pairs (the real pairs first)
+def make_symbols(count):
+    symbols = DEFAULT_SYMBOLS[:count]
+    symbols += [f"SYN{index:03d}" for index in range(count - len(symbols))]
+    return symbols
+
+# Random-walk prices, one column per symbol
+def random_walk(symbols, steps, seed=0, volatility=1e-4):
+    rng = np.random.default_rng(seed)
+    start = np.array([BASE_PRICES.get(symbol, 1.0 + 0.1 * index) for index, symbol in enumerate(symbols)])
+    steps_matrix = rng.normal(0.0, volatility, size=(steps, len(symbols)))
+    return start * np.exp(np.cumsum(steps_matrix, axis=0))
+
+# hist1s / hist1m wire format: '!YYYYMMDD,HH:MM[:SS]' followed by 'SYMBOL,price,0' lines
+def generate_timestamped_feed(symbols, start, periods, interval_seconds, seed=0):
+    prices = random_walk(symbols, periods, seed)
+    time_format = '%H:%M:%S' if interval_seconds < 60 else '%H:%M'
+    lines = []
+    for step in range(periods):
+        moment = start + timedelta(seconds=step * interval_seconds)
+        lines.append(f"!{moment:%Y%m%d},{moment.strftime(time_format)}")
+        lines.extend(f"{symbol},{price:.5f},0" for symbol, price in zip(symbols, prices[step]))
+    return ('\r\n'.join(lines) + '\r\n').encode('ascii')
+
+# hist1h wire format: '#SYMBOL' followed by 'DD.MM.YYYY,HH,price,0' lines
+def generate_symbol_block_feed(symbols, start, periods, seed=0):
+    prices = random_walk(symbols, periods, seed)
+    lines = []
+    for index, symbol in enumerate(symbols):
+        lines.append(f"#{symbol}")
+        for step in range(periods):
+            moment = start + timedelta(hours=step)
+            lines.append(f"{moment:%d.%m.%Y},{moment:%H},{prices[step, index]:.5f},0")
+    return ('\r\n'.join(lines) + '\r\n').encode('ascii')
+
+# rt wire format: a '!date,time' line per batch followed by one tick line per symbol
+def format_real_time_batch(symbols, moment, prices):
+    lines = [f"!{moment:%Y%m%d},{moment:%H:%M:%S}"]
+    lines.extend(f"{symbol},{price:.5f},0" for symbol, price in zip(symbols, prices))
+    return ('\r\n'.join(lines) + '\r\n').encode('ascii')
+
+def generate_real_time_batches(symbols, start, batches, seed=0):
+    prices = random_walk(symbols, batches, seed)
+    for step in range(batches):
+        yield format_real_time_batch(symbols, start + timedelta(seconds=step), prices[step])
+
+# Split a payload into fixed-size chunks, the way channel.recv hands it over
+def iter_chunks(payload, chunk_size=16384):
+    for offset in range(0, len(payload), chunk_size):
+        yield payload[offset:offset + chunk_size]
+
+__all__ = [
+    'DEFAULT_SYMBOLS', 'format_real_time_batch', 'generate_real_time_batches', 'generate_symbol_block_feed',
+    'generate_timestamped_feed', 'iter_chunks', 'make_symbols', 'random_walk',
+]
@@ -0,0 +1,172 @@
+import calendar
+from datetime import datetime, timedelta
+
+import numpy as np
+
+_INITIAL_CAPACITY = 1024
+_EPOCH = datetime(1970, 1, 1)
+
+# Convert a naive (feed wall-clock) datetime to epoch seconds and back
+def to_epoch(dt):
+    return calendar.timegm(dt.timetuple())
+
+def from_epoch(ts):
+    return _EPOCH + timedelta(seconds=int(ts))
+
+# Growable pair of int64 timestamp / float64 price columns for one symbol
+class TickSeries:
+    def __init__(self, capacity=_INITIAL_CAPACITY):
+        self._ts = np.empty(capacity, dtype=np.int64)
+        self._px = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    # Wrap existing (possibly memory-mapped, read-only) columns without copying
+    @classmethod
+    def from_arrays(cls, timestamps, prices):
+        series = cls(capacity=0)
+        series._ts, series._px = timestamps, prices
+        series._size = len(timestamps)
+        return series
+
+    @property
+    def timestamps(self):
+        return self._ts[:self._size]
+
+    @property
+    def prices(self):
+        return self._px[:self._size]
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        if needed <= len(self._ts):
+            return
+        capacity = max(needed, 2 * len(self._ts), _INITIAL_CAPACITY)
+        ts = np.empty(capacity, dtype=np.int64)
+        px = np.empty(capacity, dtype=np.float64)
+        ts[:self._size] = self._ts[:self._size]
+        px[:self._size] = self._px[:self._size]
+        self._ts, self._px = ts, px
+
+    def append(self, ts, price):
+        self._reserve(1)
+        self._ts[self._size] = ts
+        self._px[self._size] = price
+        self._size += 1
+
+    # Append, or overwrite the last price when ts falls on the last timestamp (bar still open).
+    # An older ts (feed clock stepped back, replayed header) is clamped onto the last bar so the
+    # series stays sorted for window() and drop_before().
+    def upsert_last(self, ts, price):
+        if self._size and self._ts[self._size - 1] >= ts:
+            self._px[self._size - 1] = price
+        else:
+            self.append(ts, price)
+
+    # Evict rows older than ts, shifting the remaining rows to the front. Adopted read-only
+    # (memory-mapped) columns are narrowed to a view instead; the next append copies only what is left.
+    def drop_before(self, ts):
+        count = int(np.searchsorted(self.timestamps, ts, side='left'))
+        if count and not self._ts.flags.writeable:
+            self._ts, self._px = self._ts[count:self._size], self._px[count:self._size]
+            self._size -= count
+        elif count:
+            remaining = self._size - count
+            self._ts[:remaining] = self._ts[count:self._size]
+            self._px[:remaining] = self._px[count:self._size]
+            self._size = remaining
+        return count
+
+    def extend(self, timestamps, prices):
+        count = len(timestamps)
+        self._reserve(count)
+        self._ts[self._size:self._size + count] = timestamps
+        self._px[self._size:self._size + count] = prices
+        self._size += count
+
+    # Sort by timestamp once (the feeds are normally already in order)
+    def finalize(self):
+        timestamps = self.timestamps
+        if len(timestamps) > 1 and np.any(timestamps[1:] < timestamps[:-1]):
+            order = np.argsort(timestamps, kind='stable')
+            self._ts[:self._size] = timestamps[order]
+            self._px[:self._size] = self.prices[order]
+
+    # Zero-copy views of the ticks with start <= ts <= end (requires finalize)
+    def window(self, start, end):
+        timestamps = self.timestamps
+        lo = np.searchsorted(timestamps, start, side='left')
+        hi = np.searchsorted(timestamps, end, side='right')
+        return timestamps[lo:hi], self.prices[lo:hi]
+
+# Columnar store of historical ticks: symbol-code table plus one TickSeries per symbol
+class TickStore:
+    def __init__(self):
+        self.symbols = []
+        self.codes = {}
+        self._series = []
+
+    def __len__(self):
+        return sum(len(series) for series in self._series)
+
+    def __contains__(self, symbol):
+        return symbol in self.codes
+
+    def symbol_code(self, symbol):
+        code = self.codes.get(symbol)
+        if code is None:
+            code = len(self.symbols)
+            self.codes[symbol] = code
+            self.symbols.append(symbol)
+            self._series.append(TickSeries())
+        return code
+
+    def append(self, symbol, ts, price):
+        self._series[self.symbol_code(symbol)].append(ts, price)
+
+    def extend(self, symbol, timestamps, prices):
+        self._series[self.symbol_code(symbol)].extend(timestamps, prices)
+
+    def upsert_last(self, symbol, ts, price):
+        self._series[self.symbol_code(symbol)].upsert_last(ts, price)
+
+    def drop_before(self, ts):
+        return sum(series.drop_before(ts) for series in self._series)
+
+    def finalize(self):
+        for series in self._series:
+            series.finalize()
+        return self
+
+    def window(self, symbol, start, end):
+        code = self.codes.get(symbol)
+        if code is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return self._series[code].window(start, end)
+
+    def adopt(self, symbol, timestamps, prices):
+        self.symbol_code(symbol)
+        self._series[self.codes[symbol]] = TickSeries.from_arrays(timestamps, prices)
+
+    def last_timestamp(self, symbol):
+        code = self.codes.get(symbol)
+        if code is None or not len(self._series[code]):
+            return None
+        return int(self._series[code].timestamps[-1])
+
+    def last_timestamps(self):
+        return {
+            symbol: int(series.timestamps[-1])
+            for symbol, series in zip(self.symbols, self._series) if len(series)
+        }
+
+    def series(self, symbol):
+        code = self.codes.get(symbol)
+        if code is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        series = self._series[code]
+        return series.timestamps, series.prices
+
+__all__ = ['TickSeries', 'TickStore', 'from_epoch', 'to_epoch']
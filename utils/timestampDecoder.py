@@ -0,0 +1,74 @@
+import calendar
+from datetime import date, datetime
+
+import numpy as np
+
+# Epoch seconds of midnight per date text, for both feed layouts ('YYYYMMDD' and 'DD.MM.YYYY').
+# Both layouts decode to the one canonical form the stores use: epoch seconds of feed wall-clock time.
+_day_offsets = {}
+
+def _day_offset(date_text, year, month, day):
+    offset = calendar.timegm(date(year, month, day).timetuple())  # date() rejects impossible dates
+    _day_offsets[date_text] = offset
+    return offset
+
+def _digits(text, *spans):
+    return all(text[start:end].isdigit() for start, end in spans)
+
+# Anything off the fixed layout (e.g. unpadded fields) goes through strptime as before
+def _strptime_epoch(text, layout):
+    return calendar.timegm(datetime.strptime(text, layout).timetuple())
+
+# Seconds since midnight of 'HH:MM:SS' or 'HH:MM'
+def clock_seconds(text):
+    if len(text) == 8 and text[2] == ':' and text[5] == ':' and _digits(text, (0, 2), (3, 5), (6, 8)):
+        hour, minute, second = int(text[:2]), int(text[3:5]), int(text[6:8])
+    elif len(text) == 5 and text[2] == ':' and _digits(text, (0, 2), (3, 5)):
+        hour, minute, second = int(text[:2]), int(text[3:5]), 0
+    else:
+        layout = '%H:%M:%S' if text.count(':') == 2 else '%H:%M'
+        return _strptime_epoch(f"19700101 {text}", f'%Y%m%d {layout}')
+    if hour > 23 or minute > 59 or second > 59:
+        raise ValueError(f"Time out of range: {text!r}")
+    return hour * 3600 + minute * 60 + second
+
+# hist1s / hist1m block header: 'YYYYMMDD' + 'HH:MM[:SS]'
+def decode_compact_timestamp(date_text, time_text):
+    offset = _day_offsets.get(date_text)
+    if offset is None:
+        if len(date_text) != 8 or not date_text.isdigit():
+            return _strptime_epoch(f"{date_text} 00", '%Y%m%d %H') + clock_seconds(time_text)
+        offset = _day_offset(date_text, int(date_text[:4]), int(date_text[4:6]), int(date_text[6:]))
+    return offset + clock_seconds(time_text)
+
+# Epoch of midnight for a hist1h 'DD.MM.YYYY' date
+def dotted_day_offset(date_text):
+    offset = _day_offsets.get(date_text)
+    if offset is None:
+        if len(date_text) != 10 or date_text[2] != '.' or date_text[5] != '.' or not _digits(date_text, (0, 2), (3, 5), (6, 10)):
+            return _strptime_epoch(date_text, '%d.%m.%Y')
+        offset = _day_offset(date_text, int(date_text[6:]), int(date_text[3:5]), int(date_text[:2]))
+    return offset
+
+def _hour_seconds(hour_text):
+    if not hour_text.isdigit() or int(hour_text) > 23:
+        return _strptime_epoch(f"19700101 {hour_text}", '%Y%m%d %H')
+    return int(hour_text) * 3600
+
+# hist1h row: 'DD.MM.YYYY' + 'HH'
+def decode_dotted_hour(date_text, hour_text):
+    return dotted_day_offset(date_text) + _hour_seconds(hour_text.strip())
+
+# Batched decode of many hist1h (date, hour) pairs: one day-offset lookup per distinct date,
+# then a single vectorized add
+def decode_dotted_hours(date_texts, hour_texts):
+    dates, inverse = np.unique(np.asarray(date_texts), return_inverse=True)
+    offsets = np.fromiter((dotted_day_offset(str(text)) for text in dates), dtype=np.int64, count=len(dates))
+    hours = np.asarray(hour_texts).astype(np.int64)
+    if len(hours) and (hours.min() < 0 or hours.max() > 23):
+        raise ValueError("Hour out of range")
+    return offsets[inverse.reshape(-1)] + hours * 3600
+
+__all__ = [
+    'clock_seconds', 'decode_compact_timestamp', 'decode_dotted_hour', 'decode_dotted_hours', 'dotted_day_offset',
+]